@@ -0,0 +1,228 @@
+import argparse
+import gc
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import plotly.utils
+
+# Benchmarks every pipeline stage and every statapp callback on synthetic tournaments of
+# increasing size. Each case reports wall time, peak traced memory (tracemalloc, measured in
+# a separate run so it does not distort the timing) and, for callbacks, the JSON payload
+# size Dash would send. Results can be written as JSON and checked against thresholds.json.
+#
+#   python benchmarks/run.py                     # every tier
+#   python benchmarks/run.py small --check       # fail when a threshold is exceeded
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT, 'ui'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datamanipulation
+import datapreparation
+from normalization import OnlineGroupStats
+from synthetic import write_raw
+
+TIERS = {
+    'small':  dict(spinners=32, judges=5, rounds=4, criteria=5),
+    'medium': dict(spinners=256, judges=7, rounds=5, criteria=5),
+    'large':  dict(spinners=2048, judges=9, rounds=6, criteria=5),
+}
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+# Time limits scale with a reference workload timed in the same process, so a slower machine
+# gets proportionally looser limits; none is tighter than the floor, far above timer noise
+SECONDS_FLOOR   = 0.05
+
+# Figure callbacks in the order of the tabs, and the selections they are called with
+CALLBACKS = [
+    'update_violin_overview',
+    'update_violin_notes_judge',
+    'update_violin_total_judge',
+    'update_heatmaps_criteria_judge',
+    'update_judge_analytics',
+    'update_criteria_plot',
+    'update_rounds_line',
+    'update_rounds_violins',
+    'update_spinners_tab',
+]
+
+
+def selections(data):
+    return {
+        'all': dict(spinners=None, judges=None, rounds=None, criteria=data.criteria),
+        'subset': dict(spinners=data.spinners[:8], judges=data.judges[:3], rounds=data.rounds[:2], criteria=data.criteria[:3]),
+    }
+
+
+def callback_kwargs(function, tournament, selection, full_points=None):
+    values = {
+        '_request': 'benchmark',
+        'tournament': tournament,
+        'selected_spinners': selection['spinners'],
+        'selected_judges': selection['judges'],
+        'selected_judge': selection['judges'],
+        'selected_rounds': selection['rounds'],
+        'selected_criteria': selection['criteria'],
+        'full_points': full_points or [],
+    }
+    # signature() follows __wrapped__, so metrics.instrument's (*args, **kwargs) wrapper is seen through
+    return {name: values[name] for name in inspect.signature(function).parameters}
+
+
+def payload_bytes(output):
+    return len(json.dumps(output, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def timed(run):
+    gc.collect()
+    start = time.perf_counter()
+    output = run()
+    return output, time.perf_counter() - start
+
+
+def traced_peak(run):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def baseline_seconds(repeats=5):
+    # Best of a few runs of a fixed pandas/numpy workload, the machine speed the limits are scaled by
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'key': rng.integers(0, 1000, 500_000), 'value': rng.normal(size=500_000)})
+    best = float('inf')
+    for _ in range(repeats):
+        _, seconds = timed(lambda: (frame.groupby('key')['value'].agg(['mean', 'std']), np.sort(frame['value'].to_numpy())))
+        best = min(best, seconds)
+    return best
+
+
+def measure(results, tier, stage, case, run, reset=None, payload=False):
+    # reset() puts the state back before each run, so cold cases stay cold
+    if reset:
+        reset()
+    output, seconds = timed(run)
+    if reset:
+        reset()
+    peak = traced_peak(run)
+    results.append({
+        'tier': tier,
+        'stage': stage,
+        'case': case,
+        'seconds': round(seconds, 4),
+        'peak_mb': round(peak / 1024 ** 2, 2),
+        'payload_kb': round(payload_bytes(output) / 1024, 1) if payload else None,
+    })
+    return output
+
+
+def prepare(event):
+    data_cleaned = datapreparation.prepare_events([event])[event]
+    datapreparation.reset_outputs(event)
+    datapreparation.save_cleaned(data_cleaned, event)
+
+
+def manipulate(event):
+    data = pd.read_parquet(datapreparation.cleaned_path(event))
+    data_long = datamanipulation.add_z_scores(datamanipulation.to_long(data))
+    datamanipulation.save_long(data_long, event)
+    datamanipulation.save_stats(OnlineGroupStats().update(data_long), event)
+
+
+def run_tier(tier, size, results):
+    event = f'bench-{tier}'
+    write_raw(event, **size)
+
+    measure(results, tier, 'datapreparation', 'full', lambda: prepare(event))
+    measure(results, tier, 'datamanipulation', 'full', lambda: manipulate(event))
+
+    # Imported here so the app's relative data paths resolve inside the benchmark directory
+    import statapp
+    catalog = statapp.catalog
+
+    def evict():
+        catalog.resident.pop(event, None)
+
+    measure(results, tier, 'load', 'cold', lambda: catalog.get(event), reset=evict)
+    data = catalog.get(event)
+
+    for name, selection in selections(data).items():
+        request = {'startRow': 0, 'endRow': statapp.GRID_BLOCK_SIZE, 'sortModel': [{'colId': 'Score', 'sort': 'desc'}]}
+        measure(results, tier, 'update_table_overview', f'{name}-cold',
+                lambda: statapp.update_table_overview(request, event, *list(selection.values())),
+                reset=data.cache.clear, payload=True)
+
+        for callback_name in CALLBACKS:
+            function = getattr(statapp, callback_name)
+            kwargs = callback_kwargs(function, event, selection)
+            measure(results, tier, callback_name, f'{name}-cold', lambda: function(**kwargs), reset=data.cache.clear, payload=True)
+            measure(results, tier, callback_name, f'{name}-warm', lambda: function(**kwargs), payload=True)
+
+        # Raw-point violins are only drawn for small selections; this is their worst case
+        kwargs = callback_kwargs(statapp.update_violin_overview, event, selection, full_points=['all'])
+        measure(results, tier, 'update_violin_overview', f'{name}-points', lambda: statapp.update_violin_overview(**kwargs),
+                reset=data.cache.clear, payload=True)
+
+
+def check(results, thresholds, baseline):
+    # thresholds.json records the baseline of the machine its limits were measured on
+    scale = baseline / thresholds['baseline_seconds']
+    failures = []
+    for row in results:
+        limits = thresholds.get(f"{row['tier']}/{row['stage']}/{row['case']}", {})
+        for metric, limit in limits.items():
+            if metric == 'seconds':
+                limit = round(max(limit * scale, SECONDS_FLOOR), 4)
+            if row.get(metric) is not None and row[metric] > limit:
+                failures.append(f"{row['tier']}/{row['stage']}/{row['case']}: {metric} {row[metric]} > {limit}")
+    return failures
+
+
+def report(results):
+    frame = pd.DataFrame(results).set_index(['tier', 'stage', 'case'])
+    with pd.option_context('display.max_rows', None, 'display.width', 120):
+        print(frame.fillna('').to_string())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline and dashboard callbacks.")
+    parser.add_argument('tiers', nargs='*', help=f"tiers to run (default: all of {', '.join(TIERS)})")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--check', action='store_true', help="exit with an error when a threshold is exceeded")
+    args = parser.parse_args()
+    tiers = args.tiers or list(TIERS)
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown:
+        parser.error(f"unknown tier(s): {', '.join(unknown)}")
+
+    results = []
+    baseline = baseline_seconds()
+    print(f"Baseline workload: {baseline:.4f} s")
+    with tempfile.TemporaryDirectory(prefix='tournament-bench-') as workdir:
+        os.chdir(workdir)
+        for tier in tiers:
+            print(f"Benchmarking {tier} ({TIERS[tier]})...")
+            run_tier(tier, TIERS[tier], results)
+        os.chdir(ROOT)
+
+    report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'baseline_seconds': round(baseline, 4), 'results': results}, f, indent=2)
+
+    if args.check:
+        with open(THRESHOLDS_PATH) as f:
+            failures = check(results, json.load(f), baseline)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
@@ -0,0 +1,65 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Synthetic tournaments shaped like data/source/<EVENT>_notes_raw.xlsx: one row per
+# (spinner, round, judge) scoresheet with one float column per criterion and a Total.
+# Every round keeps half of the previous round's spinners, like an elimination bracket.
+
+CRITERIA = ['Construction', 'Creativity', 'Deduction', 'Difficulty', 'Execution']
+
+
+def criteria_names(n_criteria):
+    extra = [f'Criterion{i}' for i in range(len(CRITERIA) + 1, n_criteria + 1)]
+    return (CRITERIA + extra)[:n_criteria]
+
+
+def raw_frame(spinners=32, judges=5, rounds=4, criteria=5, seed=0):
+    rng = np.random.default_rng(seed)
+    crit = criteria_names(criteria)
+
+    performances = []
+    for round_number in range(1, rounds + 1):
+        in_round = max(2, spinners // 2 ** (round_number - 1))
+        performances.append(pd.DataFrame({
+            'Spinner': np.repeat([f'Spinner{s:04d}' for s in range(in_round)], judges),
+            'Round': round_number,
+            'Judge': np.tile([f'Judge{j:02d}' for j in range(judges)], in_round),
+        }))
+    data = pd.concat(performances, ignore_index=True)
+
+    # Spinner skill and judge leniency offsets, so correlations and rankings are not pure noise
+    skill = rng.normal(0, 1.2, spinners)[data['Spinner'].str[7:].astype(int)]
+    leniency = rng.normal(0, 0.5, judges)[data['Judge'].str[5:].astype(int)]
+    for c in crit:
+        if c == 'Deduction':
+            # Half-point steps, as on the scoresheets; always fractional so the column stays float
+            data[c] = -rng.integers(0, 3, len(data)) - 0.5
+        else:
+            data[c] = np.clip(np.round(5 + skill + leniency + rng.normal(0, 1, len(data)), 1), 0, 10)
+    data['Total'] = data[crit].sum(axis=1)
+    return data
+
+
+def write_raw(event, directory='data/source', **size):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{event}_notes_raw.xlsx')
+    raw_frame(**size).to_excel(path, index=False)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a synthetic raw tournament workbook.")
+    parser.add_argument('event')
+    parser.add_argument('--spinners', type=int, default=32)
+    parser.add_argument('--judges', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=4)
+    parser.add_argument('--criteria', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='data/source')
+    args = parser.parse_args()
+
+    path = write_raw(args.event, args.out, spinners=args.spinners, judges=args.judges,
+                     rounds=args.rounds, criteria=args.criteria, seed=args.seed)
+    print(f"Wrote {path}")
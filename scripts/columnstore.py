@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+
+# Read-only column store for the long table: one .npy file per column under
+# data/store/<EVENT>/<version>/, attached with np.load(mmap_mode='r') so every
+# dashboard worker shares the same page-cache copy instead of holding its own.
+# A new version is written next to the old one and published by atomically
+# replacing the CURRENT pointer; workers still attached to an older version keep
+# reading it until they reload.
+
+STORE_ROOT    = 'data/store'
+KEEP_VERSIONS = 2
+
+
+def event_dir(event, root=STORE_ROOT):
+    return os.path.join(root, event)
+
+
+def current_version(event, root=STORE_ROOT):
+    try:
+        with open(os.path.join(event_dir(event, root), 'CURRENT')) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def events(root=STORE_ROOT):
+    if not os.path.isdir(root):
+        return []
+    return sorted(e for e in os.listdir(root) if current_version(e, root))
+
+
+# Smallest dtypes the dashboard works on: text identifiers as categoricals, integer columns
+# downcast (Round fits in one byte) and float scores as float32, which keeps the 0.1 steps of
+# the score sheets to 7 significant digits. Columns already compact are kept as they are, so a
+# memory-mapped frame stays zero-copy.
+def compact(frame):
+    columns = {}
+    for col in frame.columns:
+        column = frame[col]
+        if column.dtype == object:
+            column = column.astype('category')
+        elif pd.api.types.is_integer_dtype(column.dtype):
+            column = pd.to_numeric(column, downcast='integer')
+        elif pd.api.types.is_float_dtype(column.dtype) and column.dtype != np.float32:
+            column = column.astype(np.float32)
+        columns[col] = column
+    return pd.DataFrame(columns, copy=False)
+
+
+# attachments: {file name: path} of files or directories derived from the same frame (e.g. the
+# score cube and the dashboard's indexes), published together with it
+def publish(frame, event, root=STORE_ROOT, attachments=None):
+    version = f'{time.time_ns():x}'
+    version_dir = os.path.join(event_dir(event, root), version)
+    tmp_dir = version_dir + '.tmp'
+    os.makedirs(tmp_dir)
+    for file_name, path in (attachments or {}).items():
+        if os.path.isdir(path):
+            shutil.copytree(path, os.path.join(tmp_dir, file_name))
+        else:
+            shutil.copyfile(path, os.path.join(tmp_dir, file_name))
+
+    # Text columns are stored as categorical codes plus their labels
+    schema = []
+    for position, col in enumerate(frame.columns):
+        column = frame[col]
+        if column.dtype == object:
+            column = column.astype('category')
+        file_name = f'{position}.npy'
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(tmp_dir, file_name), column.cat.codes.to_numpy())
+            schema.append({'name': col, 'file': file_name, 'categories': column.cat.categories.tolist()})
+        else:
+            np.save(os.path.join(tmp_dir, file_name), column.to_numpy())
+            schema.append({'name': col, 'file': file_name})
+    with open(os.path.join(tmp_dir, 'schema.json'), 'w') as f:
+        json.dump(schema, f, default=lambda v: v.item() if isinstance(v, np.generic) else str(v))
+
+    os.rename(tmp_dir, version_dir)
+    pointer = os.path.join(event_dir(event, root), 'CURRENT')
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(version)
+    os.replace(pointer + '.tmp', pointer)
+
+    prune(event, root)
+    return version
+
+
+# Older versions beyond KEEP_VERSIONS are removed; open memory maps stay valid on POSIX
+def prune(event, root=STORE_ROOT):
+    directory = event_dir(event, root)
+    versions = sorted(v for v in os.listdir(directory) if os.path.isdir(os.path.join(directory, v)))
+    current = current_version(event, root)
+    for version in versions[:-KEEP_VERSIONS]:
+        if version != current:
+            shutil.rmtree(os.path.join(directory, version), ignore_errors=True)
+
+
+def attachment_path(event, file_name, version=None, root=STORE_ROOT):
+    version = version or current_version(event, root)
+    path = os.path.join(event_dir(event, root), version, file_name)
+    return path if os.path.exists(path) else None
+
+
+# Zero-copy DataFrame over the memory-mapped columns of the published version
+def attach(event, version=None, root=STORE_ROOT):
+    version = version or current_version(event, root)
+    version_dir = os.path.join(event_dir(event, root), version)
+    with open(os.path.join(version_dir, 'schema.json')) as f:
+        schema = json.load(f)
+
+    columns = {}
+    for entry in schema:
+        values = np.load(os.path.join(version_dir, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, entry['categories'])
+        columns[entry['name']] = pd.Series(values, copy=False)
+    return pd.DataFrame(columns, copy=False)
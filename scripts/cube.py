@@ -0,0 +1,117 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Additive (Spinner, Judge, Round, Criterion) cube of score counts, sums and sums of squares.
+# Means and standard deviations for any selection come from summing cube cells, so the
+# dashboard never rescans the long table for them. New scores are folded in by adding their
+# cells, and new spinners, judges, rounds or criteria grow the cube.
+
+CUBE_DIMENSIONS = ('Spinner', 'Judge', 'Round', 'Criterion')
+CUBE_ARRAYS     = ('count', 'sum', 'sumsq')
+
+
+def cell_sums(frame, labels, value='Score'):
+    # (count, sum, sumsq) arrays of the frame's scores, on the given sorted labels
+    shape = tuple(len(labels[dim]) for dim in CUBE_DIMENSIONS)
+    values = frame[value].to_numpy(dtype=float)
+    flat = np.zeros(len(frame), dtype=np.int64)
+    for dim, size in zip(CUBE_DIMENSIONS, shape):
+        codes = pd.Index(labels[dim]).get_indexer(np.asarray(frame[dim], dtype=object))
+        flat = flat * size + codes
+    keep = ~np.isnan(values)
+    flat, values = flat[keep], values[keep]
+    size = int(np.prod(shape))
+    return (
+        np.bincount(flat, minlength=size).astype(np.int32).reshape(shape),
+        np.bincount(flat, weights=values, minlength=size).reshape(shape),
+        np.bincount(flat, weights=values * values, minlength=size).reshape(shape),
+    )
+
+
+class ScoreCube:
+    def __init__(self, labels, count, sum_, sumsq):
+        self.labels = {dim: list(labels[dim]) for dim in CUBE_DIMENSIONS}
+        self.count = count
+        self.sum = sum_
+        self.sumsq = sumsq
+        self.lookup = {dim: {label: code for code, label in enumerate(self.labels[dim])} for dim in CUBE_DIMENSIONS}
+        # Summed over spinners: unfiltered spinner selections (the usual case) read this directly
+        self.by_judge = tuple(a.sum(axis=0) for a in (count, sum_, sumsq))
+
+    @classmethod
+    def from_frame(cls, frame, value='Score'):
+        labels = {dim: sorted(pd.unique(np.asarray(frame[dim], dtype=object))) for dim in CUBE_DIMENSIONS}
+        return cls(labels, *cell_sums(frame, labels, value))
+
+    def update(self, batch, value='Score'):
+        # New cube over the union of labels: old cells are moved to their new positions,
+        # then the batch's cells are added
+        labels = {
+            dim: sorted(set(self.labels[dim]) | set(pd.unique(np.asarray(batch[dim], dtype=object))))
+            for dim in CUBE_DIMENSIONS
+        }
+        positions = np.ix_(*(pd.Index(labels[dim]).get_indexer(self.labels[dim]) for dim in CUBE_DIMENSIONS))
+        arrays = []
+        for old, new in zip((self.count, self.sum, self.sumsq), cell_sums(batch, labels, value)):
+            new[positions] += old
+            arrays.append(new)
+        return ScoreCube(labels, *arrays)
+
+    def codes(self, dim, values):
+        lookup = self.lookup[dim]
+        return np.array(sorted({lookup[v] for v in values if v in lookup}), dtype=np.int64)
+
+    def stats(self, by, spinners=None, judges=None, rounds=None, criteria=None):
+        # Count, mean and sample std (ddof=1, like pandas) of the selection per combination of
+        # the `by` dimensions; combinations without scores are left out
+        if spinners:
+            codes = self.codes('Spinner', spinners)
+            arrays = tuple(a[codes].sum(axis=0) for a in (self.count, self.sum, self.sumsq))
+        else:
+            arrays = self.by_judge
+        dims = CUBE_DIMENSIONS[1:]
+        labels = {dim: self.labels[dim] for dim in dims}
+        for axis, (dim, values) in enumerate(zip(dims, (judges, rounds, criteria))):
+            if values:
+                codes = self.codes(dim, values)
+                arrays = tuple(a.take(codes, axis=axis) for a in arrays)
+                labels[dim] = [self.labels[dim][c] for c in codes]
+
+        summed = tuple(i for i, dim in enumerate(dims) if dim not in by)
+        count, sum_, sumsq = (a.sum(axis=summed) for a in arrays)
+        # Remaining axes follow CUBE_DIMENSIONS order; reorder to the order asked for
+        kept = [dim for dim in dims if dim in by]
+        order = [kept.index(dim) for dim in by]
+        count, sum_, sumsq = (np.transpose(a, order) for a in (count, sum_, sumsq))
+
+        index = pd.MultiIndex.from_product([labels[dim] for dim in by], names=list(by))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = sum_ / count
+            var = (sumsq - sum_ * mean) / (count - 1)
+        table = pd.DataFrame({
+            'count': count.ravel(),
+            'mean': mean.ravel(),
+            'std': np.sqrt(np.where(count > 1, np.maximum(var, 0.0), np.nan)).ravel(),
+        }, index=index)
+        return table[table['count'] > 0].reset_index()
+
+    # One .npy file per array (so the dashboard can memory-map them) and the labels as JSON
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, values in zip(CUBE_ARRAYS, (self.count, self.sum, self.sumsq)):
+            np.save(os.path.join(directory, f'{name}.npy'), values)
+        with open(os.path.join(directory, 'labels.json'), 'w') as f:
+            json.dump(self.labels, f)
+
+    # mmap_mode=None reads the arrays into memory, for a cube whose files are about to be rewritten
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        if path.endswith('.npz'):
+            # Single-file cubes published by earlier versions
+            with np.load(path) as arrays:
+                return cls(json.loads(str(arrays['labels'])), *(arrays[name] for name in CUBE_ARRAYS))
+        with open(os.path.join(path, 'labels.json')) as f:
+            labels = json.load(f)
+        return cls(labels, *(np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in CUBE_ARRAYS))
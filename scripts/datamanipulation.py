@@ -1,16 +1,74 @@
+import os
+import sys
+import tempfile
 import pandas as pd
 
-print("Data manipulation...")
+import columnstore
+from cube import ScoreCube
+from datapreparation import cleaned_path, events_from_args
+from filters import FilterEngine
+from normalization import OnlineGroupStats, z_scores
+from widematrix import WideMatrix
+
+
+def long_path(event):
+    return f'data/intermediate/{event}_notes_long.parquet'
+
+def stats_path(event):
+    return f'data/intermediate/{event}_zstats.parquet'
+
+def cube_path(event):
+    return f'data/intermediate/{event}_cube'
 
-data = pd.read_excel('data/intermediate/WT25_notes_cleaned.xlsx')
-cols = data.select_dtypes(include=["float64"]).columns
-crit = [c for c in cols if not c.__contains__('Total')]
 
 # Data long format
-data_long = data.melt(id_vars=('Spinner', 'Round', 'Judge'), value_vars=crit, var_name='Criterion', value_name='Score')
+def to_long(data):
+    cols = data.select_dtypes(include=["float64"]).columns
+    crit = [c for c in cols if not c.__contains__('Total')]
+    return data.melt(id_vars=('Spinner', 'Round', 'Judge'), value_vars=crit, var_name='Criterion', value_name='Score')
+
 
 # Z-Score Normalization
-data_long['Z-Score'] = data_long.groupby(['Criterion', 'Judge'])['Score'].transform(lambda x: (x - x.mean()) / x.std(ddof=0))
+def add_z_scores(data_long):
+    data_long['Z-Score'] = z_scores(data_long)
+    return data_long
+
+
+# Running per (Criterion, Judge) statistics, kept so later batches can be normalized incrementally
+def save_stats(accumulator, event):
+    accumulator.to_frame().to_parquet(stats_path(event), index=False)
+
+
+# Scoresheet totals (performance keys and Total) of the cleaned table, for the wide matrix
+def sheet_totals(event):
+    return pd.read_parquet(cleaned_path(event), columns=['Spinner', 'Round', 'Judge', 'Total'])
+
+
+# Save manipulated data in its compact form (categoricals, int8 rounds, float32 scores) as Parquet
+# and publish it, with its score cube, filter indexes and wide matrix, to the dashboard's shared
+# column store. The cube is built from the table unless an incrementally updated one is passed;
+# the wide matrix takes its totals from the event's cleaned table. Excel copy only on request.
+def save_long(data_long, event, excel=False, cube=None):
+    data_long = columnstore.compact(data_long)
+    data_long.to_parquet(long_path(event), index=False)
+    (cube or ScoreCube.from_frame(data_long)).save(cube_path(event))
+    with tempfile.TemporaryDirectory(dir='data/intermediate') as index_dir:
+        FilterEngine.from_frame(data_long).save(os.path.join(index_dir, 'filters'))
+        WideMatrix.from_frame(data_long, sheet=sheet_totals(event)).save(os.path.join(index_dir, 'wide'))
+        columnstore.publish(data_long, event, attachments={
+            'cube': cube_path(event),
+            'filters': os.path.join(index_dir, 'filters'),
+            'wide': os.path.join(index_dir, 'wide'),
+        })
+    if excel:
+        data_long.to_excel(long_path(event).replace('.parquet', '.xlsx'), index=False)
+
+
+if __name__ == '__main__':
+    for event in events_from_args(sys.argv):
+        print(f"Data manipulation ({event})...")
 
-# Save manipulated data
-data_long.to_excel('data/intermediate/WT25_notes_long.xlsx', index=False)
\ No newline at end of file
+        data = pd.read_parquet(cleaned_path(event))
+        data_long = add_z_scores(to_long(data))
+        save_long(data_long, event, excel='--excel' in sys.argv)
+        save_stats(OnlineGroupStats().update(data_long), event)
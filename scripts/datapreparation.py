@@ -1,36 +1,254 @@
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
 
-data_raw = pd.read_excel('data/source/WT25_notes_raw.xlsx')
+DEFAULT_EVENT      = 'WT25'
+RAW_SUFFIX         = '_notes_raw.xlsx'
+RAW_CSV_SUFFIX     = '_notes_raw.csv'
+CHUNK_ROWS         = 50_000
+ID_COLUMNS         = ['Spinner', 'Round', 'Judge', 'Source']
+# Per-event files of the later stages (datamanipulation.py, pipeline.py) under data/intermediate
+DOWNSTREAM_OUTPUTS = ['_notes_long.parquet', '_zstats.parquet', '_cube', '_pipeline_manifest.json']
 
-print("Data preparation...")
 
-# Cleaning folder structure
-import os
-for folder in ['data/intermediate', 'data/result']:
-    os.makedirs(folder, exist_ok=True)
-    for f in os.listdir(folder):
-        file_path = os.path.join(folder, f)
-        if os.path.isfile(file_path):
+# One tournament per raw sheet: data/source/<EVENT>_notes_raw.xlsx, or a .csv export of it
+def source_path(event):
+    csv_path = f'data/source/{event}{RAW_CSV_SUFFIX}'
+    if not os.path.exists(f'data/source/{event}{RAW_SUFFIX}') and os.path.exists(csv_path):
+        return csv_path
+    return f'data/source/{event}{RAW_SUFFIX}'
+
+# ...or one folder of sheets (per round, per judge, ...): data/source/<EVENT>/*.xlsx|*.csv
+def source_paths(event):
+    folder = f'data/source/{event}'
+    if os.path.isdir(folder):
+        return sorted(
+            os.path.join(folder, f) for f in os.listdir(folder)
+            if f.endswith(('.xlsx', '.csv')) and not f.startswith('~$')
+        )
+    return [source_path(event)]
+
+def cleaned_path(event):
+    return f'data/intermediate/{event}_notes_cleaned.parquet'
+
+def discover_events():
+    if not os.path.isdir('data/source'):
+        return []
+    folders = {f for f in os.listdir('data/source') if os.path.isdir(os.path.join('data/source', f))}
+    return sorted(folders | {
+        f[:-len(suffix)]
+        for f in os.listdir('data/source')
+        for suffix in (RAW_SUFFIX, RAW_CSV_SUFFIX)
+        if f.endswith(suffix)
+    })
+
+# Events named on the command line, otherwise every raw workbook found
+def events_from_args(argv):
+    named = [a for a in argv[1:] if not a.startswith('--')]
+    return named or discover_events() or [DEFAULT_EVENT]
+
+
+# Cleaning folder structure: only the exact files written for this event. A prefix match would
+# also take other tournaments whose names start with this one (WT25 and WT25_finals)
+def reset_outputs(event):
+    for folder in ['data/intermediate', 'data/result']:
+        os.makedirs(folder, exist_ok=True)
+    paths = [cleaned_path(event)] + [f'data/intermediate/{event}{suffix}' for suffix in DOWNSTREAM_OUTPUTS]
+    # with the --excel copies of the Parquet files
+    for file_path in paths + [p.replace('.parquet', '.xlsx') for p in paths if p.endswith('.parquet')]:
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path)
+        elif os.path.isfile(file_path):
             os.remove(file_path)
 
 
-# Check file format and structure
-columns_names = data_raw.columns.tolist()
+def read_raw(path):
+    return pd.read_csv(path, float_precision='round_trip') if path.endswith('.csv') else pd.read_excel(path)
+
+
+# Raw sheet in row chunks: openpyxl read-only mode (rows are streamed from the zip, never
+# held as a whole workbook) or pandas' chunked CSV reader
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_rows, float_precision='round_trip')
+        return
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [c for c in next(rows) if c is not None]
+        batch = []
+        for row in rows:
+            if any(v is not None for v in row):
+                batch.append(row[:len(header)])
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame.from_records(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+# Check file format and structure, return the criterion columns
+def criteria_columns(data_raw):
+    columns_names = data_raw.columns.tolist()
+
+    if columns_names.__contains__('Spinner') and columns_names.__contains__('Round'):
+        if data_raw['Spinner'].dtype == 'object' and data_raw['Judge'].dtype == 'object' and data_raw['Round'].dtype == 'int64':
+            cols = data_raw.select_dtypes(include=["float64"]).columns
+            return [c for c in cols if not c.__contains__('Total')]
+        else:
+            raise ValueError("Data types are incorrect. 'Spinner' should be of type object and 'Round' should be of type int64.")
+    else:
+        raise ValueError("File format is incorrect. Expected columns 'Spinner' and/or 'Round' not found.")
+
+
+# Remove NaN, duplicates, and irrelevant values (the same row in two source files is a duplicate)
+def clean(data_raw, crit):
+    data_nonan = data_raw.dropna(subset=crit, how='all')
+    data_nodup = data_nonan.drop_duplicates(subset=[c for c in data_nonan.columns if c != 'Source'])
+    return data_nodup[data_nodup['Total'] > 0]
+
+
+# Worker for the batch ingester: one source file read, validated and cleaned on its own,
+# tagged with its file name
+def prepare_file(path):
+    data_raw = read_raw(path)
+    try:
+        crit = criteria_columns(data_raw)
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+    data_raw['Source'] = os.path.basename(path)
+    return clean(data_raw, crit)
+
+
+# Cleaned files of one event merged into a single dataset; all files must share the same columns
+def merge_cleaned(frames, paths):
+    columns = list(frames[0].columns)
+    for frame, path in zip(frames, paths):
+        if list(frame.columns) != columns:
+            raise ValueError(f"{path}: columns {list(frame.columns)} do not match {paths[0]}: {columns}.")
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.drop_duplicates(subset=[c for c in columns if c != 'Source'], ignore_index=True)
+
+
+# Batch ingest: every source file of every event is cleaned in a process pool, then merged per event
+def prepare_events(events, jobs=None):
+    paths = {event: source_paths(event) for event in events}
+    if jobs == 1 or sum(len(p) for p in paths.values()) == 1:
+        return {event: merge_cleaned([prepare_file(p) for p in paths[event]], paths[event]) for event in events}
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {event: [executor.submit(prepare_file, p) for p in paths[event]] for event in events}
+        return {event: merge_cleaned([f.result() for f in futures[event]], paths[event]) for event in events}
+
+
+# Criterion columns named in a header: everything but the identifiers and the totals
+def header_criteria(columns):
+    return [c for c in columns if c not in ID_COLUMNS and 'Total' not in c]
+
+
+# Cleaned chunks of a raw sheet. The criterion columns come from the header, not from the dtypes
+# pandas infers per chunk: every criterion and Total is cast to float, so a chunk that happens to
+# hold only whole numbers (e.g. no deductions yet) keeps them. Duplicates across chunks are
+# dropped through a set of 64-bit row hashes.
+def clean_chunks(paths, chunk_rows=CHUNK_ROWS):
+    crit = None
+    seen = set()
+    for path, chunk in ((p, c) for p in paths for c in read_chunks(p, chunk_rows)):
+        chunk_crit = header_criteria(chunk.columns)
+        if crit is None:
+            crit = chunk_crit
+        if chunk_crit != crit:
+            raise ValueError(f"{path}: criterion columns {chunk_crit} do not match {crit}.")
+        try:
+            chunk = chunk.astype({c: 'float64' for c in crit + ['Total'] if c in chunk.columns})
+            criteria_columns(chunk)
+        except ValueError as error:
+            raise ValueError(f"{path}: {error}") from None
+
+        cleaned = clean(chunk, crit)
+        hashes = pd.util.hash_pandas_object(cleaned, index=False).to_numpy()
+        keep = pd.Series([h not in seen and not seen.add(h) for h in hashes.tolist()], index=cleaned.index, dtype=bool)
+        yield cleaned[keep].assign(Source=os.path.basename(path))
+
+
+# Streaming ingest: cleaned chunks are appended to the Parquet file as row groups,
+# so memory is bounded by the chunk size (plus the hash set) instead of the archive size
+def stream_cleaned(event, chunk_rows=CHUNK_ROWS, excel=False):
+    # Written next to the outputs under a name reset_outputs leaves alone; the event's previous
+    # outputs are only removed once the whole stream has been written
+    os.makedirs('data/intermediate', exist_ok=True)
+    tmp_path = os.path.join('data/intermediate', f'.{os.path.basename(cleaned_path(event))}.tmp')
+    writer = None
+    try:
+        for cleaned in clean_chunks(source_paths(event), chunk_rows):
+            table = pa.Table.from_pandas(
+                cleaned.astype({'Spinner': 'category', 'Judge': 'category', 'Source': 'category'}),
+                preserve_index=False,
+            )
+            if writer is None:
+                # int32 dictionary indices: a later chunk may hold more spinners or judges than the first
+                schema = pa.schema(
+                    [f.with_type(pa.dictionary(pa.int32(), f.type.value_type)) if pa.types.is_dictionary(f.type) else f for f in table.schema],
+                    metadata=table.schema.metadata,
+                )
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(writer.schema))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+        raise
+    if writer is None:
+        raise ValueError(f"No rows found in {', '.join(source_paths(event))}.")
+    writer.close()
+    reset_outputs(event)
+    os.replace(tmp_path, cleaned_path(event))
+    if excel:
+        pd.read_parquet(cleaned_path(event)).to_excel(cleaned_path(event).replace('.parquet', '.xlsx'), index=False)
+
+
+# Save cleaned data as typed Parquet (identifiers as categoricals), Excel copy only on request
+def save_cleaned(data_cleaned, event, excel=False):
+    data_cleaned = data_cleaned.astype({c: 'category' for c in ('Spinner', 'Judge', 'Source') if c in data_cleaned.columns})
+    data_cleaned.to_parquet(cleaned_path(event), index=False)
+    if excel:
+        data_cleaned.to_excel(cleaned_path(event).replace('.parquet', '.xlsx'), index=False)
+
+
+# --chunk-rows=N implies --stream
+def chunk_rows_from_args(argv):
+    for a in argv[1:]:
+        if a.startswith('--chunk-rows='):
+            return int(a.split('=', 1)[1])
+    return CHUNK_ROWS if '--stream' in argv else None
+
+# --jobs=N worker processes for the batch ingester (default: one per core)
+def jobs_from_args(argv):
+    for a in argv[1:]:
+        if a.startswith('--jobs='):
+            return int(a.split('=', 1)[1])
+    return None
+
 
-if columns_names.__contains__('Spinner') and columns_names.__contains__('Round'):
-    if data_raw['Spinner'].dtype == 'object' and data_raw['Judge'].dtype == 'object' and data_raw['Round'].dtype == 'int64':
-        cols = data_raw.select_dtypes(include=["float64"]).columns
-        crit = [c for c in cols if not c.__contains__('Total')]
+if __name__ == '__main__':
+    chunk_rows = chunk_rows_from_args(sys.argv)
+    events = events_from_args(sys.argv)
+    if chunk_rows:
+        for event in events:
+            print(f"Data preparation ({event}, streamed)...")
+            stream_cleaned(event, chunk_rows, excel='--excel' in sys.argv)
     else:
-        raise ValueError("Data types are incorrect. 'Spinner' should be of type object and 'Round' should be of type int64.")
-else:
-    raise ValueError("File format is incorrect. Expected columns 'Spinner' and/or 'Round' not found.")
-
-# Remove NaN, duplicates, and irrelevant values
-data_nonan = data_raw.dropna(subset=crit, how='all')
-data_nodup = data_nonan.drop_duplicates()
-data_cleaned = data_nodup[data_nodup['Total'] > 0]
-
-# Save cleaned data
-data_cleaned.to_excel('data/intermediate/WT25_notes_cleaned.xlsx', index=False)
-print("... done without error.")
\ No newline at end of file
+        print(f"Data preparation ({', '.join(events)})...")
+        for event, data_cleaned in prepare_events(events, jobs_from_args(sys.argv)).items():
+            reset_outputs(event)
+            save_cleaned(data_cleaned, event, excel='--excel' in sys.argv)
+            print(f"  {event}: {len(data_cleaned)} rows from {data_cleaned['Source'].nunique()} file(s)")
+    print("... done without error.")
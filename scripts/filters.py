@@ -0,0 +1,117 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns driven by the header dropdowns, in the order the callbacks receive them
+FILTER_DIMENSIONS = ('Spinner', 'Judge', 'Round', 'Criterion')
+
+
+def code_dtype(n_values):
+    # Smallest signed integer type holding codes 0..n_values-1 and -1 for missing
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class FilterEngine:
+    # Built once per frame. Every filter dimension is encoded to integer codes and each
+    # value keeps the sorted row positions where it appears, so a selection is answered
+    # by intersecting those row sets instead of copying the frame and running one isin
+    # pass per dropdown. The pipeline publishes the arrays with the column store, so
+    # dashboard workers memory-map one shared copy instead of building their own.
+    def __init__(self, codes, labels, postings):
+        self.dimensions = list(codes)
+        self.codes = codes
+        self.labels = labels
+        self.postings = postings
+        self.n_rows = len(next(iter(codes.values()))) if codes else 0
+        self.lookup = {dim: {label: code for code, label in enumerate(self.labels[dim])} for dim in self.dimensions}
+
+    @classmethod
+    def from_frame(cls, frame, dimensions=FILTER_DIMENSIONS):
+        codes = {}
+        labels = {}
+        postings = {}
+        for dim in (dim for dim in dimensions if dim in frame.columns):
+            column = frame[dim]
+            if isinstance(column.dtype, pd.CategoricalDtype) and column.cat.categories.is_monotonic_increasing:
+                # Sorted categoricals (e.g. a memory-mapped column store) are used in place
+                dim_codes, dim_labels = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                dim_codes, dim_labels = pd.factorize(column, sort=True)
+                dim_codes = dim_codes.astype(code_dtype(len(dim_labels)))
+            # Row positions fit in int32 below 2**31 rows, half the size of int64 postings
+            order = np.argsort(dim_codes, kind='stable').astype(code_dtype(len(frame)))
+            bounds = np.searchsorted(dim_codes[order], np.arange(len(dim_labels) + 1))
+
+            codes[dim] = dim_codes
+            labels[dim] = dim_labels.tolist()
+            postings[dim] = (order, bounds)
+        return cls(codes, labels, postings)
+
+    # One .npy file per array (so they can be memory-mapped) and the labels as JSON
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for dim in self.dimensions:
+            order, bounds = self.postings[dim]
+            for name, values in (('codes', self.codes[dim]), ('order', order), ('bounds', bounds)):
+                np.save(os.path.join(directory, f'{dim}.{name}.npy'), values)
+        with open(os.path.join(directory, 'labels.json'), 'w') as f:
+            json.dump(self.labels, f, default=lambda v: v.item() if isinstance(v, np.generic) else str(v))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, 'labels.json')) as f:
+            labels = json.load(f)
+
+        def array(dim, name):
+            return np.load(os.path.join(directory, f'{dim}.{name}.npy'), mmap_mode='r')
+
+        codes = {dim: array(dim, 'codes') for dim in labels}
+        postings = {dim: (array(dim, 'order'), array(dim, 'bounds')) for dim in labels}
+        return cls(codes, labels, postings)
+
+    def value_codes(self, dim, values):
+        lookup = self.lookup[dim]
+        return np.array(sorted({lookup[v] for v in values if v in lookup}), dtype=np.int32)
+
+    def value_rows(self, dim, value_codes):
+        # Sorted row positions holding any of the given codes
+        order, bounds = self.postings[dim]
+        if len(value_codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in value_codes])
+        rows.sort()
+        return rows
+
+    def row_count(self, dim, value_codes):
+        _order, bounds = self.postings[dim]
+        return int((bounds[value_codes + 1] - bounds[value_codes]).sum())
+
+    def indexes(self, spinners=None, judges=None, rounds=None, criteria=None):
+        # Row positions matching the selection; an empty or None selection does not filter
+        selection = dict(zip(FILTER_DIMENSIONS, (spinners, judges, rounds, criteria)))
+        active = [
+            (dim, self.value_codes(dim, selection[dim]))
+            for dim in self.dimensions
+            if selection[dim]
+        ]
+        if not active:
+            return np.arange(self.n_rows, dtype=np.int64)
+
+        # Start from the most selective dimension, then keep only rows whose code is
+        # flagged in each remaining dimension's value bitmap
+        active.sort(key=lambda item: self.row_count(*item))
+        first_dim, first_codes = active[0]
+        rows = self.value_rows(first_dim, first_codes)
+
+        for dim, value_codes in active[1:]:
+            if len(rows) == 0:
+                break
+            bitmap = np.zeros(len(self.labels[dim]), dtype=bool)
+            bitmap[value_codes] = True
+            rows = rows[bitmap[self.codes[dim][rows]]]
+        return rows
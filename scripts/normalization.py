@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Z-score normalization of the long score table, per (Criterion, Judge) group.
+# z_scores is the batch path (grouped mean/std broadcast back to the rows);
+# OnlineGroupStats keeps running per-group count/mean/M2 so new score batches
+# can be folded in without recomputing the statistics from all rows.
+
+GROUP_KEYS = ['Criterion', 'Judge']
+
+
+def z_scores(data_long, value='Score', by=GROUP_KEYS):
+    grouped = data_long.groupby(by, observed=True)[value]
+    mean = grouped.transform('mean')
+    std = grouped.transform('std', ddof=0)
+    return (data_long[value] - mean) / std
+
+
+class OnlineGroupStats:
+    # Welford/Chan accumulator, vectorized over groups: each batch is reduced with one
+    # groupby and merged into the running statistics
+    def __init__(self, value='Score', by=GROUP_KEYS):
+        self.value = value
+        self.by = list(by)
+        self.stats = pd.DataFrame(
+            {'count': pd.Series(dtype='float64'), 'mean': pd.Series(dtype='float64'), 'm2': pd.Series(dtype='float64')},
+            index=pd.MultiIndex.from_tuples([], names=self.by),
+        )
+
+    def group_index(self, frame):
+        return pd.MultiIndex.from_frame(frame[self.by].astype(object))
+
+    def update(self, batch):
+        values = batch[self.value].to_numpy(dtype=float)
+        keep = ~np.isnan(values)
+        if not keep.any():
+            return self
+        keys = self.group_index(batch[keep])
+        grouped = pd.Series(values[keep], index=keys).groupby(level=list(range(len(self.by))))
+        batch_stats = pd.DataFrame({'count': grouped.count().astype(float), 'mean': grouped.mean()})
+        batch_stats['m2'] = grouped.var(ddof=0) * batch_stats['count']
+
+        index = self.stats.index.union(batch_stats.index)
+        old = self.stats.reindex(index).fillna(0.0)
+        new = batch_stats.reindex(index).fillna(0.0)
+
+        count = old['count'] + new['count']
+        delta = new['mean'] - old['mean']
+        mean = old['mean'] + delta * new['count'] / count
+        m2 = old['m2'] + new['m2'] + delta ** 2 * old['count'] * new['count'] / count
+        self.stats = pd.DataFrame({'count': count, 'mean': mean, 'm2': m2}, index=index)
+        return self
+
+    def std(self):
+        return np.sqrt(self.stats['m2'] / self.stats['count'])
+
+    def transform(self, frame):
+        # Z-scores of the frame's rows against the current running statistics
+        positions = self.stats.index.get_indexer(self.group_index(frame))
+        mean = self.stats['mean'].to_numpy()
+        std = self.std().to_numpy()
+        found = positions >= 0
+        safe = np.where(found, positions, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (frame[self.value].to_numpy(dtype=float) - mean[safe]) / std[safe]
+        return pd.Series(np.where(found, z, np.nan), index=frame.index)
+
+    def to_frame(self):
+        return self.stats.reset_index()
+
+    @classmethod
+    def from_frame(cls, frame, value='Score', by=GROUP_KEYS):
+        accumulator = cls(value, by)
+        accumulator.stats = frame.astype({key: object for key in by}).set_index(list(by))[['count', 'mean', 'm2']]
+        return accumulator
@@ -0,0 +1,249 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+import datamanipulation
+import datapreparation
+from cube import ScoreCube
+from normalization import OnlineGroupStats
+
+# Incremental runner for the preparation and manipulation stages. A manifest keeps
+# the content hash and size of every stage's inputs and the hash of its code: unchanged
+# stages are skipped, and when the raw sheet only gained new performances (new rounds or
+# judges) just those rows are melted and merged into the existing intermediates. A CSV
+# sheet that only grew by whole lines is not parsed again, only its new lines are; an
+# Excel workbook is compressed as a whole, so it is read and cleaned again and compared
+# with the cleaned table by performance.
+
+PERFORMANCE_KEYS  = ['Spinner', 'Round', 'Judge']
+IDENTIFIERS       = ['Spinner', 'Judge', 'Criterion', 'Source']
+SCRIPTS_DIR       = os.path.dirname(os.path.abspath(__file__))
+# Every module whose code shapes a stage's output: the stage script, what it imports, and
+# this runner for the incremental merge
+PREPARATION_CODE  = ['datapreparation.py', 'pipeline.py']
+MANIPULATION_CODE = ['datamanipulation.py', 'datapreparation.py', 'normalization.py', 'columnstore.py',
+                     'cube.py', 'filters.py', 'widematrix.py', 'pipeline.py']
+
+
+# SHA-256 of the file, or of its first size bytes
+def file_hash(path, size=None):
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            block = f.read(min(1 << 20, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def manifest_path(event):
+    return f'data/intermediate/{event}_pipeline_manifest.json'
+
+
+def load_manifest(event):
+    if not os.path.exists(manifest_path(event)):
+        return {}
+    with open(manifest_path(event)) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, event):
+    tmp_path = manifest_path(event) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(event))
+
+
+def fingerprint(inputs, scripts):
+    return {
+        'inputs': {path: file_hash(path) for path in inputs},
+        'sizes': {path: os.path.getsize(path) for path in inputs},
+        'code': {script: file_hash(os.path.join(SCRIPTS_DIR, script)) for script in scripts},
+    }
+
+
+def plain(frame):
+    # Categoricals become plain objects so frames from different runs compare and concat cleanly
+    return frame.astype({c: object for c in IDENTIFIERS if c in frame.columns})
+
+
+def performance_index(frame):
+    return pd.MultiIndex.from_frame(plain(frame[PERFORMANCE_KEYS]))
+
+
+def same_rows(left, right):
+    if len(left) != len(right) or list(left.columns) != list(right.columns):
+        return False
+    hashes = [np.sort(pd.util.hash_pandas_object(plain(f), index=False).to_numpy()) for f in (left, right)]
+    return bool(np.array_equal(*hashes))
+
+
+# Offset of the first new byte of a CSV sheet that only grew by whole lines since the
+# previous run (its old content is a prefix of the file); None when it has to be parsed again
+def appended_offset(path, previous):
+    hashed, size = previous['inputs'].get(path), previous.get('sizes', {}).get(path)
+    if not path.endswith('.csv') or hashed is None or not size or os.path.getsize(path) < size:
+        return None
+    with open(path, 'rb') as f:
+        f.seek(size - 1)
+        ends_line = f.read(1) == b'\n'
+    return size if ends_line and file_hash(path, size) == hashed else None
+
+
+# The header line and the lines from offset on, parsed like the whole sheet
+def read_appended(path, offset):
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        lines = f.read()
+    return pd.read_csv(io.BytesIO(header + lines), float_precision='round_trip')
+
+
+# Cleaned new rows of an event whose sheets only grew by whole CSV lines, without parsing the
+# rest of the sheets; None when a sheet has to be parsed again or a new line edits a known performance
+def appended_rows(event, previous, existing):
+    paths = datapreparation.source_paths(event)
+    if sorted(paths) != sorted(previous['inputs']):
+        return None
+    offsets = [appended_offset(path, previous) for path in paths]
+    if any(offset is None for offset in offsets):
+        return None
+
+    columns = list(existing.columns)
+    values = [c for c in columns if c != 'Source']
+    crit = datapreparation.header_criteria(values)
+    frames = []
+    for path, offset in zip(paths, offsets):
+        if offset == os.path.getsize(path):
+            continue
+        lines = read_appended(path, offset)
+        if list(lines.columns) != values:
+            return None
+        lines = lines.astype({c: 'float64' for c in crit + ['Total']})
+        try:
+            datapreparation.criteria_columns(lines)
+        except ValueError as error:
+            raise ValueError(f"{path}: {error}") from None
+        frames.append(datapreparation.clean(lines, crit).assign(Source=os.path.basename(path)))
+    if not frames:
+        return existing.iloc[:0]
+
+    # Lines repeating a cleaned row are duplicates, dropped as in the batch merge
+    new = plain(pd.concat(frames, ignore_index=True)[columns])
+    known = set(pd.util.hash_pandas_object(plain(existing[values]), index=False).tolist())
+    new = new[~pd.util.hash_pandas_object(new[values], index=False).isin(known).to_numpy()]
+    new = new.drop_duplicates(subset=values, ignore_index=True)
+    if performance_index(new).isin(performance_index(existing)).any():
+        return None
+    return new
+
+
+def run_preparation(manifest, event, excel=False, full=False, jobs=None):
+    # Returns (cleaned rows to push downstream, whether the output was rebuilt from scratch);
+    # the rows are None when the stage was skipped
+    current = fingerprint(datapreparation.source_paths(event), PREPARATION_CODE)
+    previous = manifest.get('preparation')
+    has_output = os.path.exists(datapreparation.cleaned_path(event))
+
+    if not full and has_output and previous == current:
+        print(f"Data preparation ({event})... unchanged, skipped.")
+        return None, False
+
+    os.makedirs('data/intermediate', exist_ok=True)
+    data_cleaned = None
+
+    if not full and has_output and previous and previous['code'] == current['code']:
+        existing = pd.read_parquet(datapreparation.cleaned_path(event))
+        appended = appended_rows(event, previous, existing)
+        if appended is None:
+            # Cleaning is row-wise and duplicates share their performance, so splitting the cleaned
+            # rows into known and new performances is the same as cleaning each part of the raw rows
+            data_cleaned = datapreparation.prepare_events([event], jobs)[event]
+            is_new = ~performance_index(data_cleaned).isin(performance_index(existing))
+            if same_rows(data_cleaned[~is_new], existing):
+                appended = data_cleaned[is_new]
+        if appended is not None:
+            print(f"Data preparation ({event})... {len(appended)} new rows appended.")
+            if len(appended):
+                merged = pd.concat([plain(existing), plain(appended)], ignore_index=True)
+                datapreparation.save_cleaned(merged, event, excel)
+            manifest['preparation'] = current
+            return appended, False
+
+    print(f"Data preparation ({event})... full rebuild.")
+    if data_cleaned is None:
+        data_cleaned = datapreparation.prepare_events([event], jobs)[event]
+    datapreparation.save_cleaned(data_cleaned, event, excel)
+    manifest['preparation'] = current
+    return data_cleaned, True
+
+
+def run_manipulation(manifest, event, appended, rebuilt, cleaned_before, excel=False, full=False):
+    cleaned_path = datapreparation.cleaned_path(event)
+    current = fingerprint([cleaned_path], MANIPULATION_CODE)
+    previous = manifest.get('manipulation')
+    has_output = os.path.exists(datamanipulation.long_path(event))
+
+    if not full and has_output and previous == current:
+        print(f"Data manipulation ({event})... unchanged, skipped.")
+        return
+
+    incremental = (
+        not full and not rebuilt and has_output and appended is not None
+        and previous is not None and previous['code'] == current['code']
+        # the existing long table must have been built from the cleaned file we appended to
+        and previous['inputs'].get(cleaned_path) == cleaned_before
+    )
+    if incremental:
+        # The long table is stored compact (float32); the merge and re-normalization run in float64
+        existing = plain(pd.read_parquet(datamanipulation.long_path(event))).astype({'Score': 'float64', 'Z-Score': 'float64'})
+        new_long = plain(datamanipulation.to_long(appended))
+        merged = pd.concat([existing, new_long], ignore_index=True)
+
+        # Fold the new scores into the running (Criterion, Judge) statistics; only the
+        # judges with new rows move, and their Z-scores are re-broadcast from the stats
+        if os.path.exists(datamanipulation.stats_path(event)):
+            accumulator = OnlineGroupStats.from_frame(pd.read_parquet(datamanipulation.stats_path(event)))
+        else:
+            accumulator = OnlineGroupStats().update(existing)
+        accumulator.update(new_long)
+        affected = merged['Judge'].isin(set(new_long['Judge']))
+        merged.loc[affected, 'Z-Score'] = accumulator.transform(merged.loc[affected])
+        datamanipulation.save_stats(accumulator, event)
+        print(f"Data manipulation ({event})... {len(new_long)} rows merged, {int(affected.sum())} rows re-normalized.")
+
+        # The score cube only gains the new cells (rebuilt from the merged table if it is missing)
+        cube = None
+        if os.path.exists(datamanipulation.cube_path(event)):
+            cube = ScoreCube.load(datamanipulation.cube_path(event), mmap_mode=None).update(new_long)
+        datamanipulation.save_long(merged, event, excel, cube)
+    else:
+        print(f"Data manipulation ({event})... full rebuild.")
+        data = pd.read_parquet(cleaned_path)
+        data_long = datamanipulation.add_z_scores(datamanipulation.to_long(data))
+        datamanipulation.save_long(data_long, event, excel)
+        datamanipulation.save_stats(OnlineGroupStats().update(data_long), event)
+
+    manifest['manipulation'] = current
+
+
+if __name__ == '__main__':
+    excel = '--excel' in sys.argv
+    full = '--full' in sys.argv
+
+    for event in datapreparation.events_from_args(sys.argv):
+        manifest = {} if full else load_manifest(event)
+        cleaned_path = datapreparation.cleaned_path(event)
+        cleaned_before = file_hash(cleaned_path) if os.path.exists(cleaned_path) else None
+
+        appended, rebuilt = run_preparation(manifest, event, excel, full, datapreparation.jobs_from_args(sys.argv))
+        run_manipulation(manifest, event, appended, rebuilt, cleaned_before, excel, full)
+        save_manifest(manifest, event)
+    print("... done without error.")
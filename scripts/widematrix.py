@@ -0,0 +1,125 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from filters import FilterEngine
+
+# Columns identifying one performance (one judge's scoresheet for one spinner in one round)
+PERFORMANCE_KEYS = ('Spinner', 'Round', 'Judge')
+
+
+class WideMatrix:
+    # The (performance x criterion) score matrix, built once from the long table.
+    # It replaces both the separately loaded wide workbook and the per-callback
+    # pivot_table calls: selections are answered by row/column masks on the matrix.
+    # Performances are only kept as the filter engine's key codes; like the engine, the
+    # matrix is published with the column store and memory-mapped by the dashboard.
+    # Totals are the scoresheets' own Total column, not a sum of the criteria: deductions and
+    # weights are applied however the sheet applies them.
+    def __init__(self, matrix, criteria, filters, totals):
+        self.matrix = matrix
+        self.criteria = list(criteria)
+        self.filters = filters
+        self.totals = totals
+
+    # sheet: the cleaned scoresheets (performance keys and Total). Without it the totals are the
+    # sum of the criteria, which is only right for unweighted criteria with negative deductions.
+    @classmethod
+    def from_frame(cls, long_df, value='Score', sheet=None):
+        key_codes = []
+        key_labels = []
+        for col in PERFORMANCE_KEYS:
+            codes, labels = pd.factorize(long_df[col], sort=True)
+            key_codes.append(codes.astype(np.int64))
+            key_labels.append(labels)
+
+        combined = np.zeros(len(long_df), dtype=np.int64)
+        for codes, labels in zip(key_codes, key_labels):
+            combined = combined * len(labels) + codes
+        criterion_codes, criteria = pd.factorize(long_df['Criterion'], sort=True)
+        values = long_df[value].to_numpy(dtype=float)
+        valid = ~np.isnan(values) & (criterion_codes >= 0)
+        for codes in key_codes:
+            valid &= codes >= 0
+
+        # Performances sorted by (Spinner, Round, Judge), like the pivot_table index
+        performance_keys, performance_codes = np.unique(combined[valid], return_inverse=True)
+        n_performances, n_criteria = len(performance_keys), len(criteria)
+
+        # Mean per cell, as pivot_table(aggfunc="mean") would give for duplicated rows
+        flat = performance_codes * n_criteria + criterion_codes[valid]
+        sums = np.bincount(flat, weights=values[valid], minlength=n_performances * n_criteria)
+        counts = np.bincount(flat, minlength=n_performances * n_criteria)
+        # Kept as float32 like the long table's scores
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = np.where(counts > 0, sums / counts, np.nan).astype(np.float32).reshape(n_performances, n_criteria)
+
+        remaining = performance_keys.copy()
+        decoded = {}
+        for col, labels in reversed(list(zip(PERFORMANCE_KEYS, key_labels))):
+            decoded[col] = labels.take(remaining % len(labels))
+            remaining //= len(labels)
+        performances = pd.DataFrame({col: decoded[col] for col in PERFORMANCE_KEYS})
+
+        if sheet is None:
+            totals = np.nansum(matrix, axis=1, dtype=np.float64).astype(np.float32)
+        else:
+            # Mean per performance, like the criterion cells, when several source files score it
+            sheet_totals = sheet.astype({'Round': 'int64'}).groupby(list(PERFORMANCE_KEYS), observed=True)['Total'].mean()
+            keys = pd.MultiIndex.from_frame(performances.astype({'Round': 'int64'}))
+            totals = sheet_totals.reindex(keys).to_numpy(dtype=np.float32)
+        return cls(matrix, criteria, FilterEngine.from_frame(performances, PERFORMANCE_KEYS), totals)
+
+    def save(self, directory):
+        self.filters.save(os.path.join(directory, 'performances'))
+        np.save(os.path.join(directory, 'matrix.npy'), self.matrix)
+        np.save(os.path.join(directory, 'totals.npy'), self.totals)
+        with open(os.path.join(directory, 'criteria.json'), 'w') as f:
+            json.dump(self.criteria, f)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, 'criteria.json')) as f:
+            criteria = json.load(f)
+        matrix = np.load(os.path.join(directory, 'matrix.npy'), mmap_mode='r')
+        totals_file = os.path.join(directory, 'totals.npy')
+        # Versions published before the totals were stored fall back to the sum of the criteria
+        totals = np.load(totals_file, mmap_mode='r') if os.path.exists(totals_file) else np.nansum(matrix, axis=1, dtype=np.float64).astype(np.float32)
+        return cls(matrix, criteria, FilterEngine.load(os.path.join(directory, 'performances')), totals)
+
+    def rows(self, spinners=None, judges=None, rounds=None):
+        return self.filters.indexes(spinners, judges, rounds)
+
+    def columns(self, criteria=None):
+        if not criteria:
+            return np.arange(len(self.criteria))
+        wanted = set(criteria)
+        return np.array([i for i, c in enumerate(self.criteria) if c in wanted], dtype=np.int64)
+
+    def block(self, rows, columns):
+        # Performances with at least one score in the selected criteria, and their scores
+        scores = self.matrix[np.ix_(rows, columns)]
+        keep = ~np.isnan(scores).all(axis=1)
+        return rows[keep], [self.criteria[c] for c in columns], scores[keep]
+
+    def judge_codes(self, rows):
+        # Judge of each performance row, re-coded over the judges present
+        codes, present = pd.factorize(self.filters.codes['Judge'][rows], sort=True)
+        labels = self.filters.labels['Judge']
+        return codes, [labels[c] for c in present]
+
+    def frame(self, rows=None):
+        # Wide table (performance keys, one column per criterion and Total) for the given rows
+        if rows is None:
+            rows = np.arange(self.filters.n_rows)
+        out = pd.DataFrame({
+            col: pd.Categorical.from_codes(self.filters.codes[col][rows], self.filters.labels[col])
+            for col in PERFORMANCE_KEYS
+        })
+        scores = self.matrix[rows]
+        for i, criterion in enumerate(self.criteria):
+            out[criterion] = scores[:, i]
+        out['Total'] = self.totals[rows]
+        return out
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import datapreparation
+
+
+def raw_sheet(n_spinners=30, n_judges=5):
+    rows = pd.DataFrame({
+        'Spinner': np.repeat([f'Spinner{s:02d}' for s in range(n_spinners)], n_judges),
+        'Round': 1,
+        'Judge': np.tile([f'Judge{j}' for j in range(n_judges)], n_spinners),
+    })
+    rng = np.random.default_rng(0)
+    for c in ['Construction', 'Creativity', 'Difficulty', 'Execution']:
+        rows[c] = np.round(rng.uniform(3, 9, len(rows)), 1)
+    # No deductions in the first chunk, so pandas reads that chunk's Deduction column as int64
+    rows['Deduction'] = pd.Series([0 if i < 128 else -0.5 for i in range(len(rows))], dtype=object)
+    rows['Total'] = rows[['Construction', 'Creativity', 'Difficulty', 'Execution', 'Deduction']].astype(float).sum(axis=1)
+    return rows
+
+
+@pytest.mark.parametrize('suffix', [datapreparation.RAW_CSV_SUFFIX, datapreparation.RAW_SUFFIX])
+def test_stream_accepts_whole_number_first_chunk(tmp_path, monkeypatch, suffix):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/source')
+    path = f'data/source/EV{suffix}'
+    sheet = raw_sheet()
+    sheet.to_csv(path, index=False) if suffix.endswith('.csv') else sheet.to_excel(path, index=False)
+
+    datapreparation.stream_cleaned('EV', chunk_rows=128)
+    streamed = pd.read_parquet(datapreparation.cleaned_path('EV'))
+    batch = datapreparation.prepare_events(['EV'], jobs=1)['EV']
+
+    assert len(streamed) == len(batch) == len(sheet)
+    assert streamed['Deduction'].dtype == 'float64'
+    pd.testing.assert_frame_equal(
+        streamed.astype({c: 'object' for c in ['Spinner', 'Judge', 'Source']}).reset_index(drop=True),
+        batch.astype({c: 'object' for c in ['Spinner', 'Judge', 'Source']}).reset_index(drop=True),
+    )
+
+
+def test_reset_outputs_keeps_events_sharing_a_prefix(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/intermediate')
+    names = ['WT25_notes_cleaned.parquet', 'WT25_notes_long.xlsx', 'WT25_pipeline_manifest.json',
+             'WT25_finals_notes_cleaned.parquet', 'WT25_finals_notes_long.parquet', 'WT25_finals_pipeline_manifest.json']
+    for name in names:
+        open(os.path.join('data/intermediate', name), 'w').close()
+    for name in ['WT25_cube', 'WT25_finals_cube']:
+        os.makedirs(os.path.join('data/intermediate', name))
+        names.append(name)
+
+    datapreparation.reset_outputs('WT25')
+
+    assert sorted(os.listdir('data/intermediate')) == [n for n in sorted(names) if n.startswith('WT25_finals_')]
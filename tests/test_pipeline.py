@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import datapreparation
+import pipeline
+
+
+def raw_sheet(rounds):
+    rows = pd.DataFrame([(f'Spinner{s}', r, f'Judge{j}') for r in rounds for s in range(8) for j in range(3)],
+                        columns=['Spinner', 'Round', 'Judge'])
+    rng = np.random.default_rng(rounds[0])
+    for c in ['Construction', 'Creativity', 'Execution']:
+        rows[c] = np.round(rng.uniform(3, 9, len(rows)), 1)
+    rows['Total'] = rows[['Construction', 'Creativity', 'Execution']].sum(axis=1)
+    return rows
+
+
+def prepare(event):
+    manifest = pipeline.load_manifest(event)
+    appended, rebuilt = pipeline.run_preparation(manifest, event, jobs=1)
+    pipeline.save_manifest(manifest, event)
+    return appended, rebuilt
+
+
+def test_appended_csv_lines_are_cleaned_without_parsing_the_sheet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/source')
+    path = f'data/source/EV{datapreparation.RAW_CSV_SUFFIX}'
+    raw_sheet([1, 2]).to_csv(path, index=False)
+    prepare('EV')
+
+    new_round = raw_sheet([3])
+    with open(path, 'a') as f:
+        new_round.to_csv(f, index=False, header=False)
+
+    def parse(*args, **kwargs):
+        raise AssertionError("the whole sheet was parsed again")
+    with monkeypatch.context() as patch:
+        patch.setattr(datapreparation, 'prepare_events', parse)
+        appended, rebuilt = prepare('EV')
+
+    assert not rebuilt and len(appended) == len(new_round)
+    incremental = pd.read_parquet(datapreparation.cleaned_path('EV'))
+    batch = datapreparation.prepare_events(['EV'], jobs=1)['EV']
+    assert pipeline.same_rows(incremental, batch)
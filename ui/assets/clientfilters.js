@@ -0,0 +1,178 @@
+// Client-side filtering mode (TOURNAMENT_CLIENT_FILTERS=1). The server sends the tournament's
+// score table once per version as typed arrays (one dimension code per row, float32 scores);
+// filter changes are answered here by re-aggregating those arrays into the judge/criterion
+// heatmaps and the round line. Without a matching table the request goes on to the server.
+(function () {
+    const ARRAY_TYPES = {i1: Int8Array, i2: Int16Array, i4: Int32Array, f4: Float32Array, f8: Float64Array};
+    const DIMENSIONS = ['Spinner', 'Judge', 'Round', 'Criterion'];
+
+    let decoded = null;  // {payload, codes, score} of the last table received
+
+    function decode(column) {
+        const text = atob(column.bdata);
+        const bytes = new Uint8Array(text.length);
+        for (let i = 0; i < text.length; i++) {
+            bytes[i] = text.charCodeAt(i);
+        }
+        return new ARRAY_TYPES[column.dtype](bytes.buffer);
+    }
+
+    function table(payload) {
+        if (!decoded || decoded.payload !== payload) {
+            const codes = {};
+            DIMENSIONS.forEach(dim => { codes[dim] = decode(payload.codes[dim]); });
+            decoded = {payload: payload, codes: codes, score: decode(payload.score)};
+        }
+        return decoded;
+    }
+
+    // The request is the tab gate's JSON [tournament, spinners, judges, rounds, criteria, full_points, version]
+    function parse(request, payload) {
+        const selection = JSON.parse(request);
+        if (!payload || payload.tournament !== selection[0] || payload.version !== selection[6]) {
+            return null;
+        }
+        return {Spinner: selection[1], Judge: selection[2], Round: selection[3], Criterion: selection[4]};
+    }
+
+    // One flag per code of dim, or null when the dropdown is empty (no filtering)
+    function allowed(labels, values) {
+        if (!values || !values.length) {
+            return null;
+        }
+        const wanted = new Set(values.map(String));
+        return Uint8Array.from(labels, label => wanted.has(String(label)) ? 1 : 0);
+    }
+
+    // Count, sum and sum of squares of the selected scores per (rowDim, colDim) cell
+    function cellSums(payload, selection, rowDim, colDim) {
+        const data = table(payload);
+        const filters = DIMENSIONS
+            .map(dim => [data.codes[dim], allowed(payload.labels[dim], selection[dim])])
+            .filter(item => item[1] !== null);
+        const rows = data.codes[rowDim], cols = data.codes[colDim], score = data.score;
+        const nCols = payload.labels[colDim].length;
+        const size = payload.labels[rowDim].length * nCols;
+        const count = new Float64Array(size), sum = new Float64Array(size), sumsq = new Float64Array(size);
+
+        outer:
+        for (let i = 0; i < score.length; i++) {
+            const value = score[i];
+            if (value !== value) {
+                continue;
+            }
+            for (let f = 0; f < filters.length; f++) {
+                if (!filters[f][1][filters[f][0][i]]) {
+                    continue outer;
+                }
+            }
+            const cell = rows[i] * nCols + cols[i];
+            count[cell] += 1;
+            sum[cell] += value;
+            sumsq[cell] += value * value;
+        }
+        return {count: count, sum: sum, sumsq: sumsq, nCols: nCols};
+    }
+
+    // Mean and sample std (ddof=1) of a cell, null where pandas would give NaN
+    function mean(sums, cell) {
+        return sums.count[cell] > 0 ? sums.sum[cell] / sums.count[cell] : null;
+    }
+
+    function std(sums, cell) {
+        const n = sums.count[cell];
+        if (n < 2) {
+            return null;
+        }
+        const m = sums.sum[cell] / n;
+        return Math.sqrt(Math.max((sums.sumsq[cell] - sums.sum[cell] * m) / (n - 1), 0));
+    }
+
+    function heatmap(skeleton, sums, rowLabels, colLabels, keptRows, keptCols, value) {
+        const figure = JSON.parse(JSON.stringify(skeleton));
+        if (!keptRows.length) {
+            return figure;
+        }
+        Object.assign(figure.data[0], {
+            x: keptCols.map(c => colLabels[c]),
+            y: keptRows.map(r => rowLabels[r]),
+            z: keptRows.map(r => keptCols.map(c => value(sums, r * sums.nCols + c))),
+            hovertemplate: 'Criterion: %{x}<br>Judge: %{y}<br>color: %{z}<extra></extra>',
+        });
+        return figure;
+    }
+
+    // Row and column codes with at least one score
+    function present(sums) {
+        const nRows = sums.count.length / sums.nCols;
+        const rows = [], cols = [];
+        const colSeen = new Uint8Array(sums.nCols);
+        for (let r = 0; r < nRows; r++) {
+            let seen = false;
+            for (let c = 0; c < sums.nCols; c++) {
+                if (sums.count[r * sums.nCols + c] > 0) {
+                    seen = true;
+                    colSeen[c] = 1;
+                }
+            }
+            if (seen) {
+                rows.push(r);
+            }
+        }
+        colSeen.forEach((seen, c) => { if (seen) cols.push(c); });
+        return {rows: rows, cols: cols};
+    }
+
+    function judgeHeatmaps(request, payload) {
+        const no_update = window.dash_clientside.no_update;
+        const selection = request && parse(request, payload);
+        if (!selection) {
+            return [no_update, no_update, request];
+        }
+        const judges = payload.labels.Judge, criteria = payload.labels.Criterion;
+        const sums = cellSums(payload, selection, 'Judge', 'Criterion');
+        const kept = present(sums);
+        return [
+            heatmap(payload.figures.mean, sums, judges, criteria, kept.rows, kept.cols, mean),
+            heatmap(payload.figures.std, sums, judges, criteria, kept.rows, kept.cols, std),
+            no_update,
+        ];
+    }
+
+    function roundLine(request, payload) {
+        const no_update = window.dash_clientside.no_update;
+        const selection = request && parse(request, payload);
+        if (!selection) {
+            return [no_update, request];
+        }
+        const rounds = payload.labels.Round, criteria = payload.labels.Criterion;
+        const sums = cellSums(payload, selection, 'Criterion', 'Round');
+        const figure = JSON.parse(JSON.stringify(payload.figures.line));
+        const colorway = figure.layout.template.layout.colorway;
+        // One trace per criterion with scores, coloured in order like plotly express
+        present(sums).rows.forEach((c, i) => {
+            const keptRounds = rounds.map((_, r) => r).filter(r => sums.count[c * sums.nCols + r] > 0);
+            const name = String(criteria[c]);
+            figure.data.push({
+                hovertemplate: 'Criterion=' + name + '<br>Round=%{x}<br>Score=%{y}<extra></extra>',
+                legendgroup: name,
+                line: {color: colorway[i % colorway.length], dash: 'solid'},
+                marker: {symbol: 'circle'},
+                mode: 'lines',
+                name: name,
+                orientation: 'v',
+                showlegend: true,
+                x: keptRounds.map(r => rounds[r]),
+                y: keptRounds.map(r => mean(sums, c * sums.nCols + r)),
+                xaxis: 'x',
+                yaxis: 'y',
+                type: 'scatter',
+            });
+        });
+        return [figure, no_update];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        tournament: {judgeHeatmaps: judgeHeatmaps, roundLine: roundLine},
+    });
+})();
@@ -0,0 +1,98 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def selection_key(spinners=None, judges=None, rounds=None, criteria=None):
+    # Dropdown values arrive as lists in click order (or None); the key is the
+    # sorted, de-duplicated, frozen form so equal selections share one entry
+    return tuple(
+        tuple(sorted(set(values))) if values else ()
+        for values in (spinners, judges, rounds, criteria)
+    )
+
+
+def estimate_size(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class SelectionCache:
+    # Bounded LRU shared by all callbacks. Entries are keyed on (kind, name, selection)
+    # and hold filtered row indexes, aggregate tables or serialized figures.
+    # on_lookup(hit) is called on every get, e.g. to attribute hits to a callback.
+    def __init__(self, max_bytes=256 * 1024 ** 2, on_lookup=None):
+        self.max_bytes = max_bytes
+        self.on_lookup = on_lookup
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            hit = key in self.entries
+            if hit:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                value = self.entries[key][0]
+            else:
+                self.misses += 1
+                value = default
+        if self.on_lookup is not None:
+            self.on_lookup(hit)
+        return value
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Larger than the whole budget: serve it but never keep it
+                return value
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _key, (_value, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
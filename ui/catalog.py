@@ -0,0 +1,211 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import columnstore
+import metrics
+from cache import SelectionCache
+from cube import ScoreCube
+from filters import FilterEngine
+from normalization import z_scores
+from widematrix import WideMatrix
+
+LONG_SUFFIX  = '_notes_long'
+SHEET_SUFFIX = '_notes_cleaned'
+
+logger = logging.getLogger(__name__)
+
+
+def load_long(path):
+    # Parquet written by scripts/ is memory-mapped; older Excel intermediates still load
+    if path.endswith('.parquet'):
+        df_long = pd.read_parquet(path, memory_map=True)
+    else:
+        df_long = pd.read_excel(path)
+    if 'Z-Score' not in df_long.columns:
+        df_long['Z-Score'] = z_scores(df_long.astype({'Score': 'float64'}))
+    # Older intermediates were written with object identifiers and float64 scores
+    return columnstore.compact(df_long)
+
+
+def load_sheet_totals(path):
+    # Scoresheet totals from the cleaned table next to a long table, None when it is missing
+    path = os.path.join(os.path.dirname(path), os.path.basename(path).replace(LONG_SUFFIX, SHEET_SUFFIX))
+    if not os.path.exists(path):
+        return None
+    columns = ['Spinner', 'Round', 'Judge', 'Total']
+    return pd.read_parquet(path, columns=columns) if path.endswith('.parquet') else pd.read_excel(path, usecols=columns)
+
+
+class Dataset:
+    # One tournament's long table and everything the callbacks derive from it
+    def __init__(self, name, df_long, cache_bytes=256 * 1024 ** 2, version=None, cube=None, filters=None, wide=None):
+        self.name = name
+        self.version = version
+        self.df_long = df_long
+        # Shared filter indexes, the performance x criterion matrix (the wide view of the same
+        # scores, no second workbook) and the count/sum/sum-of-squares cube for mean and std
+        # figures. Published by the pipeline and memory-mapped from the store; built here for
+        # tournaments loaded from a plain intermediate file
+        self.filters = filters or FilterEngine.from_frame(df_long)
+        self.wide = wide or WideMatrix.from_frame(df_long)
+        self.cube = cube or ScoreCube.from_frame(df_long)
+        # Memoized filter results, aggregate tables and serialized figures
+        self.cache = SelectionCache(max_bytes=cache_bytes, on_lookup=metrics.cache_lookup if metrics.ENABLED else None)
+
+        self.spinners = self.filters.labels['Spinner']
+        self.judges = self.filters.labels['Judge']
+        self.rounds = self.filters.labels['Round']
+        self.criteria = self.filters.labels['Criterion']
+
+
+class Catalog:
+    # Discovers every tournament under data/intermediate and loads each one on first
+    # access; at most max_resident datasets stay in memory (least recently used goes first).
+    # Tournaments published to the shared column store are attached from it instead, so
+    # all workers map the same files. With watch_interval set, a background thread reloads
+    # resident tournaments when the pipeline publishes a new version and swaps them in; a
+    # request that finds its tournament outdated before then reloads it first.
+    def __init__(self, root='data/intermediate', max_resident=3, cache_bytes=256 * 1024 ** 2,
+                 store_root=columnstore.STORE_ROOT, watch_interval=None):
+        self.root = root
+        self.store_root = store_root
+        self.max_resident = max_resident
+        self.cache_bytes = cache_bytes
+        self.watch_interval = watch_interval
+        self.resident = OrderedDict()
+        self.lock = threading.Lock()
+        self.loading = {}
+        self.watcher_pid = None
+
+    def paths(self):
+        found = {}
+        if os.path.isdir(self.root):
+            # Parquet wins over an Excel copy of the same tournament
+            for f in sorted(os.listdir(self.root), key=lambda f: f.endswith('.parquet')):
+                stem, ext = os.path.splitext(f)
+                if stem.endswith(LONG_SUFFIX) and ext in ('.parquet', '.xlsx'):
+                    found[stem[:-len(LONG_SUFFIX)]] = os.path.join(self.root, f)
+        return found
+
+    def version(self, name):
+        # Store version when published there, otherwise the intermediate file's mtime
+        store_version = columnstore.current_version(name, self.store_root)
+        if store_version:
+            return store_version
+        path = self.paths().get(name)
+        return str(os.stat(path).st_mtime_ns) if path else None
+
+    def versions(self):
+        return {name: self.version(name) for name in self.names()}
+
+    def stamp(self):
+        # Changes whenever a tournament is added, republished or removed
+        return sorted(self.versions().items())
+
+    def names(self):
+        return sorted(set(self.paths()) | set(columnstore.events(self.store_root)))
+
+    def default(self):
+        names = self.names()
+        return names[-1] if names else None
+
+    def load(self, name):
+        version = self.version(name)
+        if version is not None and version == columnstore.current_version(name, self.store_root):
+            # Versions published before the store was compact are converted on load
+            df_long = columnstore.compact(columnstore.attach(name, version, self.store_root))
+            # Versions published before the cube was split into .npy files hold cube.npz
+            cube_file = columnstore.attachment_path(name, 'cube', version, self.store_root) or columnstore.attachment_path(name, 'cube.npz', version, self.store_root)
+            filters_dir = columnstore.attachment_path(name, 'filters', version, self.store_root)
+            wide_dir = columnstore.attachment_path(name, 'wide', version, self.store_root)
+            return Dataset(
+                name, df_long, self.cache_bytes, version,
+                cube=ScoreCube.load(cube_file) if cube_file else None,
+                filters=FilterEngine.load(filters_dir) if filters_dir else None,
+                wide=WideMatrix.load(wide_dir) if wide_dir else None,
+            )
+        paths = self.paths()
+        if name not in paths:
+            raise KeyError(f"Unknown tournament: {name}")
+        df_long = load_long(paths[name])
+        wide = WideMatrix.from_frame(df_long, sheet=load_sheet_totals(paths[name]))
+        return Dataset(name, df_long, self.cache_bytes, version, wide=wide)
+
+    def get(self, name=None):
+        self.start_watcher()
+        name = name or self.default()
+        with self.lock:
+            dataset = self.resident.get(name)
+            if dataset is not None:
+                self.resident.move_to_end(name)
+        if dataset is not None:
+            # Checked on every call, not just on the watcher's tick: a worker still holding the
+            # previous version would otherwise compute figures from it and share them through
+            # the callback cache under the new version's stamp
+            if dataset.version == self.version(name):
+                return dataset
+            return self.refresh(name) or self.get(name)
+
+        with self.lock:
+            # One loader per tournament: concurrent requests wait for the same load
+            name_lock = self.loading.setdefault(name, threading.Lock())
+
+        with name_lock:
+            with self.lock:
+                if name in self.resident:
+                    self.resident.move_to_end(name)
+                    return self.resident[name]
+            dataset = self.load(name)
+
+            with self.lock:
+                self.resident[name] = dataset
+                while len(self.resident) > self.max_resident:
+                    self.resident.popitem(last=False)
+                self.loading.pop(name, None)
+        return dataset
+
+    def refresh(self, name):
+        # Loads a newer version off to the side, then swaps it in; the old dataset and its
+        # caches are dropped once the requests still holding it finish
+        with self.lock:
+            dataset = self.resident.get(name)
+            name_lock = self.loading.setdefault(name, threading.Lock())
+        if dataset is None or dataset.version == self.version(name):
+            return None
+
+        with name_lock:
+            with self.lock:
+                if self.resident.get(name) is not dataset:
+                    # Swapped in (or evicted) by another thread while this one waited
+                    return None
+            fresh = self.load(name)
+            with self.lock:
+                if name in self.resident:
+                    self.resident[name] = fresh
+                self.loading.pop(name, None)
+        return fresh
+
+    def start_watcher(self):
+        # Threads do not survive a fork, so each (gunicorn) worker starts its own on first use
+        with self.lock:
+            if self.watch_interval is None or self.watcher_pid == os.getpid():
+                return
+            self.watcher_pid = os.getpid()
+        threading.Thread(target=self.watch, name='catalog-watcher', daemon=True).start()
+
+    def watch(self):
+        while True:
+            time.sleep(self.watch_interval)
+            for name in list(self.resident):
+                try:
+                    fresh = self.refresh(name)
+                    if fresh is not None:
+                        logger.info('Reloaded %s (%s)', name, fresh.version)
+                except Exception as e:
+                    # Half-written intermediates: keep the current version, retry on the next tick
+                    logger.warning('Reload of %s failed: %s', name, e)
@@ -0,0 +1,64 @@
+import numpy as np
+
+# Leave-one-out correlation between each criterion and the total of the other
+# criteria, for every group (judge) at once. Everything comes from grouped sums,
+# sums of squares and cross-products, so there is no loop over judge/criterion pairs.
+
+
+def grouped_sums(values, starts, order):
+    return np.add.reduceat(values[order], starts, axis=0)
+
+
+def leave_one_out_correlations(matrix, groups, n_groups, z_critical=1.96):
+    # matrix: performances x criteria scores (NaN where a criterion is missing)
+    # groups: integer group code of every performance row, in [0, n_groups)
+    matrix = np.asarray(matrix, dtype=float)
+    groups = np.asarray(groups)
+    shape = (n_groups, matrix.shape[1])
+    if matrix.size == 0:
+        empty = np.full(shape, np.nan)
+        return empty, empty.copy(), empty.copy(), np.zeros(shape, dtype=np.int64)
+
+    present = ~np.isnan(matrix)
+    scores = np.where(present, matrix, 0.0)
+    # Same as pandas' row sum: missing criteria count as zero in the total
+    rest = scores.sum(axis=1, keepdims=True) - scores
+
+    # Shift by the column means for numerical stability (correlation is shift invariant)
+    weight = present.astype(float)
+    n_present = np.maximum(weight.sum(axis=0), 1.0)
+    x = (scores - (scores * weight).sum(axis=0) / n_present) * weight
+    y = (rest - (rest * weight).sum(axis=0) / n_present) * weight
+
+    order = np.argsort(groups, kind="stable")
+    starts = np.searchsorted(groups[order], np.arange(n_groups))
+    occupied = np.bincount(groups, minlength=n_groups) > 0
+    starts = np.minimum(starts, len(groups) - 1)
+
+    n = grouped_sums(weight, starts, order)
+    sx = grouped_sums(x, starts, order)
+    sy = grouped_sums(y, starts, order)
+    sxx = grouped_sums(x * x, starts, order)
+    syy = grouped_sums(y * y, starts, order)
+    sxy = grouped_sums(x * y, starts, order)
+    # reduceat returns the single row at an empty group's start; blank those groups out
+    for sums in (n, sx, sy, sxx, syy, sxy):
+        sums[~occupied] = 0.0
+
+    covariance = n * sxy - sx * sy
+    variance_x = n * sxx - sx ** 2
+    variance_y = n * syy - sy ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = covariance / np.sqrt(variance_x * variance_y)
+    valid = (n >= 2) & (variance_x > 1e-12 * np.maximum(n * sxx, 1.0)) & (variance_y > 1e-12 * np.maximum(n * syy, 1.0))
+    corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+
+    # Fisher z confidence interval, defined from four paired observations on
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fisher = np.arctanh(np.clip(corr, -0.999999, 0.999999))
+        margin = z_critical / np.sqrt(n - 3)
+    has_interval = valid & (n > 3)
+    low = np.where(has_interval, np.tanh(fisher - margin), np.nan)
+    high = np.where(has_interval, np.tanh(fisher + margin), np.nan)
+
+    return corr, low, high, n.astype(np.int64)
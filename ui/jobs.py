@@ -0,0 +1,93 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from dash import DiskcacheManager
+
+# Background callback jobs on a bounded pool of threads in the worker that received the request.
+# DiskcacheManager starts one process per job, and everything that process loads or caches (the
+# tournament, its filtered rows, aggregates and figures) is thrown away when it exits. A thread
+# shares the worker's catalog and selection caches, so what one figure computes is reused by the
+# next. Results and running marks still go through the diskcache, so whichever worker the client
+# polls can answer.
+# A thread cannot be killed, so cancellation is cooperative: Dash terminates a superseded job,
+# which sets its token and removes its running mark, and the figure builders call checkpoint()
+# between phases (filter, aggregate, figure), which ends the job there.
+
+JOB_THREADS      = 4
+JOB_MARK_SECONDS = 600  # bounds the running mark of a job whose result is never collected
+
+local = threading.local()
+
+
+class JobCancelled(BaseException):
+    # Not an Exception, so Dash's job wrapper does not store it as the callback's error result
+    pass
+
+
+class Job:
+    def __init__(self, manager, job_id):
+        self.manager = manager
+        self.id = job_id
+        self.token = threading.Event()
+
+    def cancelled(self):
+        # The token is set by this worker; a job terminated through another worker only loses its mark
+        return self.token.is_set() or not self.manager.job_running(self.id)
+
+
+def checkpoint():
+    # Raises JobCancelled in a background job whose result is no longer wanted; no-op elsewhere
+    job = getattr(local, 'job', None)
+    if job is not None and job.cancelled():
+        raise JobCancelled
+
+
+class ThreadJobManager(DiskcacheManager):
+    def __init__(self, cache=None, cache_by=None, expire=None, threads=JOB_THREADS):
+        super().__init__(cache, cache_by, expire)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='callback-job')
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def job_key(self, job):
+        return f'thread-job-{job}'
+
+    def call_job_fn(self, key, job_fn, args, context):
+        job = Job(self, uuid.uuid4().hex)
+        # The mark is removed when the result is collected (terminate_job), not when the job
+        # ends, so a poll never sees the job finished before its result is readable
+        self.handle.set(self.job_key(job.id), os.getpid(), expire=JOB_MARK_SECONDS)
+        with self.lock:
+            self.jobs[job.id] = job
+        self.pool.submit(self.run, job, job_fn, (key, self._make_progress_key(key), args, context))
+        return job.id
+
+    def run(self, job, job_fn, args):
+        local.job = job
+        try:
+            # A job superseded while it waited for a thread never starts
+            if not job.cancelled():
+                job_fn(*args)
+        except JobCancelled:
+            pass
+        finally:
+            local.job = None
+            with self.lock:
+                self.jobs.pop(job.id, None)
+
+    def job_running(self, job):
+        return self.handle.get(self.job_key(job)) is not None
+
+    def terminate_job(self, job):
+        if job is None:
+            return
+        with self.lock:
+            running = self.jobs.get(job)
+        if running is not None:
+            running.token.set()
+        self.handle.delete(self.job_key(job))
+
+    def terminate_unhealthy_job(self, job):
+        return False
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# Judge analytics from the long score table, for every judge, criterion and round at once.
+# Each score is compared with the rest of the panel that scored the same spinner in the same
+# round on the same criterion. Leniency offsets, outlier flags and the one-way ICC come from
+# grouped sums (bincount over integer cell codes); Kendall's W ranks one (performance x
+# criterion/round/judge) matrix in a single pass. There is no loop over judges or judge pairs.
+
+OUTLIER_Z       = 3.0
+OUTLIER_PANEL   = 2     # other judges a score needs before it can be flagged
+
+
+def factorize(frame, dims):
+    codes = {}
+    labels = {}
+    for dim in dims:
+        column_codes, column_labels = pd.factorize(frame[dim], sort=True)
+        codes[dim] = column_codes.astype(np.int64)
+        labels[dim] = list(column_labels)
+    return codes, labels
+
+
+def icc_one_way(groups, targets, scores, n_groups, n_targets):
+    # ICC(1) of every group (criterion, or criterion and round): between-target against
+    # within-target variance of the scores, with the usual k0 correction for targets scored
+    # by different numbers of judges. Returns (icc, targets, scores) per group.
+    cell = groups * n_targets + targets
+    size = n_groups * n_targets
+    k = np.bincount(cell, minlength=size).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        target_mean = np.bincount(cell, weights=scores, minlength=size) / k
+        n_scores = np.bincount(groups, minlength=n_groups).astype(float)
+        grand = np.bincount(groups, weights=scores, minlength=n_groups) / n_scores
+        k = k.reshape(n_groups, n_targets)
+        between = (k * (np.nan_to_num(target_mean.reshape(n_groups, n_targets)) - grand[:, None]) ** 2).sum(axis=1)
+        within = np.bincount(groups, weights=(scores - target_mean[cell]) ** 2, minlength=n_groups)
+        n = (k > 0).sum(axis=1).astype(float)
+        ms_between = between / (n - 1)
+        ms_within = within / (n_scores - n)
+        k0 = (n_scores - (k ** 2).sum(axis=1) / n_scores) / (n - 1)
+        icc = (ms_between - ms_within) / (ms_between + (k0 - 1) * ms_within)
+    valid = (n >= 2) & (n_scores > n) & (ms_between + (k0 - 1) * ms_within > 0)
+    return np.where(valid, icc, np.nan), n.astype(np.int64), n_scores.astype(np.int64)
+
+
+def kendall_w(groups, targets, judges, scores, n_groups, n_targets, n_judges):
+    # Kendall's W (tie-corrected) of every group over the targets scored by all of the group's
+    # judges. Returns (w, judges, complete targets) per group.
+    values = np.full((n_targets, n_groups, n_judges), np.nan)
+    values[targets, groups, judges] = scores
+    judged = ~np.isnan(values)
+    m = judged.any(axis=0).sum(axis=1)
+    complete = judged.sum(axis=2) == m[None, :]
+    values[~complete] = np.nan
+    n = complete.sum(axis=0)
+
+    # One column per (group, judge); pandas ranks every column at once, ties averaged
+    matrix = values.reshape(n_targets, n_groups * n_judges)
+    ranks = pd.DataFrame(matrix).rank(axis=0).to_numpy().reshape(n_targets, n_groups, n_judges)
+    rank_sums = np.where(complete, np.nansum(ranks, axis=2), np.nan)
+    spread = np.nansum((rank_sums - m * (n + 1) / 2) ** 2, axis=0)
+
+    # Tie correction: sum of t^3 - t over runs of equal scores in each column
+    column, row = np.nonzero(~np.isnan(matrix.T))
+    tied = matrix[row, column]
+    order = np.lexsort((tied, column))
+    column, tied = column[order], tied[order]
+    run_start = np.ones(len(column), dtype=bool)
+    run_start[1:] = (np.diff(column) != 0) | (np.diff(tied) != 0)
+    starts = np.flatnonzero(run_start)
+    runs = np.diff(np.r_[starts, len(column)]).astype(float)
+    ties = np.bincount(column[starts], weights=runs ** 3 - runs, minlength=n_groups * n_judges)
+    ties = ties.reshape(n_groups, n_judges).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        denominator = m.astype(float) ** 2 * (n.astype(float) ** 3 - n) - m * ties
+        w = 12 * spread / denominator
+    valid = (m >= 2) & (n >= 2) & (denominator > 0)
+    return np.where(valid, w, np.nan), m, n
+
+
+def analyze_judges(frame, outlier_z=OUTLIER_Z):
+    # Everything the judge analytics show, from one pass over the selected rows
+    scored = frame[~frame['Score'].isna()]
+    codes, labels = factorize(scored, ('Spinner', 'Judge', 'Round', 'Criterion'))
+    n_spinners, n_judges, n_rounds, n_criteria = (len(labels[dim]) for dim in ('Spinner', 'Judge', 'Round', 'Criterion'))
+    spinner, judge, round_, criterion = (codes[dim] for dim in ('Spinner', 'Judge', 'Round', 'Criterion'))
+    scores = scored['Score'].to_numpy(dtype=float)
+
+    # Leave-one-out panel mean of every score: the other judges on the same spinner, round and criterion
+    item = (spinner * n_rounds + round_) * n_criteria + criterion
+    n_items = n_spinners * n_rounds * n_criteria
+    panel_size = np.bincount(item, minlength=n_items)[item]
+    others = panel_size - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        panel_mean = (np.bincount(item, weights=scores, minlength=n_items)[item] - scores) / others
+    deviation = np.where(others >= 1, scores - panel_mean, np.nan)
+
+    # Outliers: deviation standardized by the root mean square deviation of its criterion and round
+    compared = others >= OUTLIER_PANEL
+    group = criterion * n_rounds + round_
+    n_groups = n_criteria * n_rounds
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rms = np.sqrt(np.bincount(group[compared], weights=deviation[compared] ** 2, minlength=n_groups)
+                      / np.bincount(group[compared], minlength=n_groups))
+        z = np.where(compared, deviation / rms[group], np.nan)
+    flagged = np.abs(np.nan_to_num(z)) > outlier_z
+
+    # Leniency and outlier counts per judge x criterion x round
+    cell = (judge * n_criteria + criterion) * n_rounds + round_
+    n_cells = n_judges * n_criteria * n_rounds
+    has_panel = others >= 1
+    offset_scores = np.bincount(cell[has_panel], minlength=n_cells)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        offsets = np.bincount(cell[has_panel], weights=deviation[has_panel], minlength=n_cells) / offset_scores
+    outliers = np.bincount(cell[flagged], minlength=n_cells)
+    index = pd.MultiIndex.from_product([labels['Judge'], labels['Criterion'], labels['Round']], names=['Judge', 'Criterion', 'Round'])
+    leniency = pd.DataFrame({
+        'Offset': offsets,
+        'Scores': offset_scores,
+        'Outliers': outliers,
+    }, index=index)
+    leniency = leniency[leniency['Scores'] > 0].reset_index()
+
+    # Agreement per criterion and round (targets: spinners), and per criterion over all
+    # selected rounds (targets: spinner performances)
+    icc, targets, n_scores = icc_one_way(group, spinner, scores, n_groups, n_spinners)
+    w, panel, complete = kendall_w(group, spinner, judge, scores, n_groups, n_spinners, n_judges)
+    agreement = pd.DataFrame({
+        'ICC': icc,
+        'Kendall W': w,
+        'Judges': panel,
+        'Spinners': targets,
+        'Complete': complete,
+        'Scores': n_scores,
+    }, index=pd.MultiIndex.from_product([labels['Criterion'], labels['Round']], names=['Criterion', 'Round']))
+    agreement = agreement[agreement['Scores'] > 0].reset_index()
+
+    performance = spinner * n_rounds + round_
+    icc, targets, n_scores = icc_one_way(criterion, performance, scores, n_criteria, n_spinners * n_rounds)
+    w, panel, complete = kendall_w(criterion, performance, judge, scores, n_criteria, n_spinners * n_rounds, n_judges)
+    criterion_agreement = pd.DataFrame({
+        'Criterion': labels['Criterion'],
+        'ICC': icc,
+        'Kendall W': w,
+        'Judges': panel,
+        'Performances': targets,
+        'Complete': complete,
+        'Scores': n_scores,
+    })
+
+    flagged_rows = pd.DataFrame({
+        'Spinner': np.asarray(labels['Spinner'], dtype=object)[spinner[flagged]],
+        'Round': np.asarray(labels['Round'], dtype=object)[round_[flagged]],
+        'Judge': np.asarray(labels['Judge'], dtype=object)[judge[flagged]],
+        'Criterion': np.asarray(labels['Criterion'], dtype=object)[criterion[flagged]],
+        'Score': scores[flagged],
+        'Panel Mean': panel_mean[flagged],
+        'Deviation': z[flagged],
+    })
+    flagged_rows = flagged_rows.iloc[np.argsort(-np.abs(flagged_rows['Deviation'].to_numpy()), kind='stable')].reset_index(drop=True)
+
+    return {
+        'leniency': leniency,
+        'agreement': agreement,
+        'criterion_agreement': criterion_agreement,
+        'outliers': flagged_rows,
+    }
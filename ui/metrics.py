@@ -0,0 +1,218 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import dash
+import plotly.utils
+from dash import html, dcc, Input, Output, callback
+
+# Opt-in callback instrumentation, enabled with TOURNAMENT_METRICS=1. Each instrumented
+# callback records its wall time, the time spent in each phase (filter, aggregate, figure,
+# serialize), rows processed, response payload size and cache hits. The totals are served
+# in Prometheus text format at /metrics and shown in a collapsible debug panel.
+# TOURNAMENT_PROFILE_SLOW_MS=<ms> additionally runs callbacks under cProfile and keeps the
+# profile of every call slower than that under data/profiles/.
+
+ENABLED         = os.environ.get('TOURNAMENT_METRICS') == '1'
+PROFILE_SLOW_MS = float(os.environ.get('TOURNAMENT_PROFILE_SLOW_MS') or 0)
+PROFILE_DIR     = 'data/profiles'
+PANEL_SECONDS   = 3
+
+logger = logging.getLogger(__name__)
+local = threading.local()
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.callbacks = defaultdict(lambda: {
+            'calls': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0,
+            'payload_bytes': 0, 'cache_hits': 0, 'cache_misses': 0, 'phases': defaultdict(float),
+        })
+
+    def record(self, name, seconds, call, payload_bytes, failed):
+        with self.lock:
+            totals = self.callbacks[name]
+            totals['calls'] += 1
+            totals['errors'] += int(failed)
+            totals['seconds'] += seconds
+            totals['max_seconds'] = max(totals['max_seconds'], seconds)
+            totals['rows'] += call['rows']
+            totals['payload_bytes'] += payload_bytes
+            totals['cache_hits'] += call['cache_hits']
+            totals['cache_misses'] += call['cache_misses']
+            for phase_name, phase_seconds in call['phases'].items():
+                totals['phases'][phase_name] += phase_seconds
+
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(totals, phases=dict(totals['phases'])) for name, totals in self.callbacks.items()}
+
+
+registry = Registry()
+
+
+# Phases nest (a figure build filters first); time is charged to the innermost phase only
+@contextmanager
+def phase(name):
+    call = getattr(local, 'call', None)
+    if call is None:
+        yield
+        return
+    stack = call['stack']
+    now = time.perf_counter()
+    if stack:
+        outer, started = stack[-1]
+        call['phases'][outer] += now - started
+    stack.append((name, now))
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        _name, started = stack.pop()
+        call['phases'][name] += now - started
+        if stack:
+            stack[-1] = (stack[-1][0], now)
+
+
+def count_rows(n):
+    call = getattr(local, 'call', None)
+    if call is not None:
+        call['rows'] += int(n)
+
+
+def cache_lookup(hit):
+    call = getattr(local, 'call', None)
+    if call is not None:
+        call['cache_hits' if hit else 'cache_misses'] += 1
+
+
+def save_profile(name, profiler):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident()}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def instrument(function):
+    if not ENABLED:
+        return function
+
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        call = {'phases': defaultdict(float), 'stack': [], 'rows': 0, 'cache_hits': 0, 'cache_misses': 0}
+        local.call = call
+        profiler = cProfile.Profile() if PROFILE_SLOW_MS else None
+        output, failed = None, True
+        start = time.perf_counter()
+        try:
+            output = profiler.runcall(function, *args, **kwargs) if profiler else function(*args, **kwargs)
+            failed = False
+            return output
+        finally:
+            seconds = time.perf_counter() - start
+            local.call = None
+            # Dash serializes the response the same way once the callback returns
+            encode_start = time.perf_counter()
+            payload_bytes = 0 if failed else len(json.dumps(output, cls=plotly.utils.PlotlyJSONEncoder))
+            call['phases']['response'] += time.perf_counter() - encode_start
+            registry.record(name, seconds, call, payload_bytes, failed)
+            if profiler and seconds * 1000 >= PROFILE_SLOW_MS:
+                logger.warning('Slow %s (%.0f ms), profile saved to %s', name, seconds * 1000, save_profile(name, profiler))
+
+    return wrapper
+
+
+def prometheus_text(catalog=None):
+    callbacks = registry.snapshot()
+    lines = []
+
+    def metric(metric_name, kind, help_text, samples):
+        lines.append(f'# HELP {metric_name} {help_text}')
+        lines.append(f'# TYPE {metric_name} {kind}')
+        for labels, value in samples:
+            label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f'{metric_name}{{{label_text}}} {value}')
+
+    metric('tournament_callback_calls_total', 'counter', 'Callback invocations.',
+           [({'callback': n}, t['calls']) for n, t in callbacks.items()])
+    metric('tournament_callback_errors_total', 'counter', 'Callback invocations that raised.',
+           [({'callback': n}, t['errors']) for n, t in callbacks.items()])
+    metric('tournament_callback_seconds_total', 'counter', 'Wall time spent in the callback.',
+           [({'callback': n}, round(t['seconds'], 6)) for n, t in callbacks.items()])
+    metric('tournament_callback_seconds_max', 'gauge', 'Slowest single call.',
+           [({'callback': n}, round(t['max_seconds'], 6)) for n, t in callbacks.items()])
+    metric('tournament_callback_phase_seconds_total', 'counter', 'Wall time per phase inside the callback.',
+           [({'callback': n, 'phase': p}, round(s, 6)) for n, t in callbacks.items() for p, s in t['phases'].items()])
+    metric('tournament_callback_rows_total', 'counter', 'Rows selected by the callback filters.',
+           [({'callback': n}, t['rows']) for n, t in callbacks.items()])
+    metric('tournament_callback_payload_bytes_total', 'counter', 'JSON response size.',
+           [({'callback': n}, t['payload_bytes']) for n, t in callbacks.items()])
+    metric('tournament_callback_cache_hits_total', 'counter', 'Selection cache hits during the callback.',
+           [({'callback': n}, t['cache_hits']) for n, t in callbacks.items()])
+    metric('tournament_callback_cache_misses_total', 'counter', 'Selection cache misses during the callback.',
+           [({'callback': n}, t['cache_misses']) for n, t in callbacks.items()])
+
+    if catalog is not None:
+        caches = [(name, dataset.cache.stats()) for name, dataset in list(catalog.resident.items())]
+        metric('tournament_cache_bytes', 'gauge', 'Bytes held by the selection cache.',
+               [({'tournament': n}, s['bytes']) for n, s in caches])
+        metric('tournament_cache_entries', 'gauge', 'Entries held by the selection cache.',
+               [({'tournament': n}, s['entries']) for n, s in caches])
+        metric('tournament_cache_evictions_total', 'counter', 'Selection cache evictions.',
+               [({'tournament': n}, s['evictions']) for n, s in caches])
+    return '\n'.join(lines) + '\n'
+
+
+def register(server, catalog=None):
+    if not ENABLED:
+        return
+
+    @server.route('/metrics')
+    def metrics_endpoint():
+        return prometheus_text(catalog), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
+def summary_table():
+    rows = [f"{'callback':<32}{'calls':>7}{'mean ms':>10}{'max ms':>10}{'rows':>10}{'KB':>9}{'hits':>7}{'miss':>7}  phases (ms)"]
+    for name, t in sorted(registry.snapshot().items()):
+        calls = max(t['calls'], 1)
+        phases = ' '.join(f'{p}={s * 1000 / calls:.1f}' for p, s in sorted(t['phases'].items()))
+        rows.append(
+            f"{name:<32}{t['calls']:>7}{t['seconds'] * 1000 / calls:>10.1f}{t['max_seconds'] * 1000:>10.1f}"
+            f"{t['rows'] // calls:>10}{t['payload_bytes'] / 1024 / calls:>9.1f}{t['cache_hits']:>7}{t['cache_misses']:>7}  {phases}"
+        )
+    return '\n'.join(rows)
+
+
+# Debug panel: collapsed by default, refreshed only while open
+def panel():
+    if not ENABLED:
+        return []
+    return [
+        html.Details([
+            html.Summary("Callback metrics"),
+            html.Pre(id='metrics-table', className="metrics-table"),
+        ], id='metrics-panel', className="metrics-panel"),
+        dcc.Interval(id='metrics-poll', interval=PANEL_SECONDS * 1000),
+    ]
+
+
+if ENABLED:
+    @callback(
+        Output('metrics-table', 'children'),
+        Input('metrics-poll', 'n_intervals'),
+        Input('metrics-panel', 'open'),
+    )
+    def update_metrics_panel(_n_intervals, is_open):
+        if not is_open:
+            return dash.no_update
+        return summary_table()
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+# Spinner rankings from the long score table, for every spinner at once. Scores are
+# first reduced to performance tensors (spinner x round x judge); standings, round
+# progression, head-to-head records and bootstrap rank intervals are array operations
+# on those tensors, with no loop over spinners.
+
+RESAMPLES       = 2000
+RESAMPLE_CELLS  = 2_000_000
+H2H_BATCH       = 64
+RANK_LEVEL      = 0.95
+
+
+def performance_tensors(frame):
+    # (spinners, rounds, judges, totals, z) where totals[s, r, j] is the sum of the
+    # performance's criterion scores and z[s, r, j] the mean of its Z-scores; NaN where
+    # the spinner did not perform for that judge in that round
+    codes = []
+    labels = []
+    for col in ('Spinner', 'Round', 'Judge'):
+        column_codes, column_labels = pd.factorize(frame[col], sort=True)
+        codes.append(column_codes.astype(np.int64))
+        labels.append(list(column_labels))
+    shape = tuple(len(l) for l in labels)
+    flat = (codes[0] * shape[1] + codes[1]) * shape[2] + codes[2]
+    size = int(np.prod(shape))
+
+    scores = frame['Score'].to_numpy(dtype=float)
+    z_scores = frame['Z-Score'].to_numpy(dtype=float)
+    scored = ~np.isnan(scores)
+    counts = np.bincount(flat[scored], minlength=size)
+    totals = np.bincount(flat[scored], weights=scores[scored], minlength=size)
+    z_valid = ~np.isnan(z_scores)
+    z_counts = np.bincount(flat[z_valid], minlength=size)
+    z_sums = np.bincount(flat[z_valid], weights=z_scores[z_valid], minlength=size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        totals = np.where(counts > 0, totals, np.nan).reshape(shape)
+        z = np.where(z_counts > 0, z_sums / z_counts, np.nan).reshape(shape)
+    return labels[0], labels[1], labels[2], totals, z
+
+
+def competition_ranks(values):
+    # 1 for the highest value, ties share the best rank, NaN last
+    order = pd.Series(values).rank(ascending=False, method='min', na_option='bottom')
+    return order.to_numpy(dtype=np.int64)
+
+
+def progression(totals):
+    # Round score of each spinner: mean judge total per round (spinners x rounds)
+    with np.errstate(invalid='ignore'):
+        present = ~np.isnan(totals)
+        sums = np.where(present, totals, 0.0).sum(axis=2)
+        return np.where(present.any(axis=2), sums / np.maximum(present.sum(axis=2), 1), np.nan)
+
+
+def head_to_head(totals, batch=H2H_BATCH):
+    # wins[a, b]: performances where a outscored b for the same judge in the same round;
+    # meetings[a, b]: performances where both were scored. Computed in blocks of rows so
+    # the (batch x spinners x rounds*judges) comparison stays bounded in memory.
+    n = totals.shape[0]
+    flat = totals.reshape(n, totals.shape[1] * totals.shape[2])
+    present = ~np.isnan(flat)
+    filled = np.where(present, flat, -np.inf)
+    wins = np.zeros((n, n), dtype=np.int16)
+    meetings = np.zeros((n, n), dtype=np.int16)
+    for start in range(0, n, batch):
+        block = slice(start, start + batch)
+        both = present[block, None, :] & present[None, :, :]
+        wins[block] = ((filled[block, None, :] > filled[None, :, :]) & both).sum(axis=2)
+        meetings[block] = both.sum(axis=2)
+    return wins, meetings
+
+
+def bootstrap_ranks(z, resamples=RESAMPLES, level=RANK_LEVEL, seed=0):
+    # Rank interval of every spinner: each resample redraws every spinner's performances
+    # (their Z-scores) with replacement and re-ranks the resampled means. Resamples are
+    # drawn in batches of about RESAMPLE_CELLS draws to bound memory.
+    n = z.shape[0]
+    flat = z.reshape(n, z.shape[1] * z.shape[2])
+    present = ~np.isnan(flat)
+    counts = present.sum(axis=1)
+    width = max(int(counts.max()), 1) if n else 1
+    # Each spinner's performances packed to the left of a (spinners x width) matrix
+    order = np.argsort(~present, axis=1, kind='stable')[:, :width]
+    packed = np.take_along_axis(np.where(present, flat, 0.0), order, axis=1)
+    valid = counts > 0
+
+    rng = np.random.default_rng(seed)
+    ranks = np.empty((resamples, n), dtype=np.int32)
+    draw_counts = np.maximum(counts, 1)[None, :, None]
+    batch = max(1, RESAMPLE_CELLS // max(n * width, 1))
+    for start in range(0, resamples, batch):
+        size = min(batch, resamples - start)
+        picks = (rng.random((size, n, width), dtype=np.float32) * draw_counts).astype(np.intp)
+        drawn = np.take_along_axis(packed[None], picks, axis=2)
+        # Only the first count draws of each spinner are used, so every resample has its size
+        used = np.arange(width)[None, None, :] < counts[None, :, None]
+        means = np.where(valid, (drawn * used).sum(axis=2) / draw_counts[..., 0], -np.inf)
+        ranks[start:start + size] = np.argsort(np.argsort(-means, axis=1, kind='stable'), axis=1) + 1
+
+    tail = (1 - level) / 2
+    low, high = np.quantile(ranks, [tail, 1 - tail], axis=0, method='nearest')
+    return low.astype(np.int64), high.astype(np.int64)
+
+
+def rank_spinners(frame, resamples=RESAMPLES, seed=0):
+    # Everything the Spinners tab shows, from one pass over the selected rows
+    spinners, rounds, judges, totals, z = performance_tensors(frame)
+    per_round = progression(totals)
+    performed = ~np.isnan(totals)
+    n_performances = performed.sum(axis=(1, 2))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_total = np.where(performed, totals, 0.0).sum(axis=(1, 2)) / n_performances
+        z_present = ~np.isnan(z)
+        mean_z = np.where(z_present, z, 0.0).sum(axis=(1, 2)) / z_present.sum(axis=(1, 2))
+    last = np.where(performed.any(axis=2), np.arange(len(rounds)), -1).max(axis=1, initial=-1)
+    last_round = pd.Series(np.asarray(rounds)[np.maximum(last, 0)]).where(last >= 0)
+    low, high = bootstrap_ranks(z, resamples, seed=seed)
+
+    standings = pd.DataFrame({
+        'Rank': competition_ranks(mean_z),
+        'Spinner': spinners,
+        'Mean Z-Score': mean_z,
+        'Rank low': low,
+        'Rank high': high,
+        'Total rank': competition_ranks(mean_total),
+        'Mean Total': mean_total,
+        'Last Round': last_round,
+        'Performances': n_performances,
+    }).sort_values(['Rank', 'Spinner'], kind='stable').reset_index(drop=True)
+
+    wins, meetings = head_to_head(totals)
+    return {
+        'standings': standings,
+        'progression': pd.DataFrame(per_round, index=spinners, columns=rounds),
+        'wins': wins,
+        'meetings': meetings,
+        'spinners': spinners,
+    }
@@ -0,0 +1,183 @@
+import argparse
+import html
+import inspect
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.io as pio
+import plotly.offline
+
+import statapp
+
+# Headless report export: renders every dashboard tab for the whole tournament and for each
+# judge and each round on its own, as static HTML (plus the figures' JSON) under
+# data/result/<EVENT>/. The figures come from the statapp callbacks themselves, so reports
+# match the dashboard. Selections are spread over a process pool; the tournaments are loaded
+# before the pool forks, and each worker's selection cache keeps the aggregates its
+# selections share.
+#
+#   python ui/report.py                       # every tournament, all/judge/round reports
+#   python ui/report.py WT25 --by judge --jobs 4
+
+RESULT_ROOT = 'data/result'
+SELECTIONS  = ('all', 'judge', 'round')
+
+# Report sections in tab order: (title, callback)
+SECTIONS = [
+    ('Overview', 'update_violin_overview'),
+    ('Judges', 'update_violin_notes_judge'),
+    ('Judges', 'update_heatmaps_criteria_judge'),
+    ('Judges', 'update_judge_analytics'),
+    ('Judges', 'update_violin_total_judge'),
+    ('Criteria', 'update_criteria_plot'),
+    ('Rounds', 'update_rounds_line'),
+    ('Rounds', 'update_rounds_violins'),
+    ('Spinners', 'update_spinners_tab'),
+]
+
+
+def file_label(value):
+    return re.sub(r'[^\w.-]+', '_', str(value))
+
+
+def selections(tournament, kinds):
+    # (file stem, page title, judges, rounds) for every report of one tournament
+    data = statapp.catalog.get(tournament)
+    found = []
+    if 'all' in kinds:
+        found.append(('all', 'All judges, all rounds', None, None))
+    if 'judge' in kinds:
+        found += [(f'judge-{file_label(j)}', f'Judge {j}', [j], None) for j in data.judges]
+    if 'round' in kinds:
+        found += [(f'round-{file_label(r)}', f'Round {r}', None, [r]) for r in data.rounds]
+    return found
+
+
+def callback_kwargs(function, tournament, judges, rounds, full_points):
+    values = {
+        '_request': 'report',
+        'tournament': tournament,
+        'selected_spinners': None,
+        'selected_judges': judges,
+        'selected_judge': judges,
+        'selected_rounds': rounds,
+        'selected_criteria': statapp.catalog.get(tournament).criteria,
+        'full_points': full_points,
+    }
+    # signature() follows __wrapped__, so metrics.instrument's (*args, **kwargs) wrapper is seen through
+    return {name: values[name] for name in inspect.signature(function).parameters}
+
+
+def outputs(section):
+    # Figures and tables returned by one callback, as a list
+    return list(section) if isinstance(section, tuple) else [section]
+
+
+def output_html(output):
+    if isinstance(output, list):
+        # Spinners standings (grid rowData)
+        return pd.DataFrame(output).to_html(index=False, border=0, classes='standings', na_rep='')
+    return pio.to_html(output, full_html=False, include_plotlyjs=False, validate=False)
+
+
+def render(task):
+    tournament, stem, title, judges, rounds, full_points, out_dir = task
+    start = time.perf_counter()
+    figures = {}
+    body = []
+    previous_section = None
+    for section_title, callback_name in SECTIONS:
+        function = getattr(statapp, callback_name)
+        if section_title != previous_section:
+            body.append(f'<h2>{section_title}</h2>')
+            previous_section = section_title
+        for i, output in enumerate(outputs(function(**callback_kwargs(function, tournament, judges, rounds, full_points)))):
+            figures[f'{callback_name}-{i}'] = output
+            body.append(f'<div class="figure">{output_html(output)}</div>')
+
+    page = (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(tournament)} - {html.escape(title)}</title>'
+        '<script src="plotly.min.js"></script><link rel="stylesheet" href="report.css"></head>'
+        f'<body><h1>{html.escape(tournament)} &mdash; {html.escape(title)}</h1>{"".join(body)}</body></html>'
+    )
+    with open(os.path.join(out_dir, f'{stem}.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+    with open(os.path.join(out_dir, f'{stem}.json'), 'w', encoding='utf-8') as f:
+        json.dump(figures, f)
+    return tournament, stem, title, time.perf_counter() - start
+
+
+REPORT_CSS = """
+body { font-family: Calibri, "Helvetica Neue", Arial, sans-serif; background: #edf5ff; color: #1b0c4b; margin: 20px 40px; }
+.figure { background: #ffffff; border-radius: 14px; margin-bottom: 20px; padding: 10px; }
+.standings { border-collapse: collapse; font-size: 13px; }
+.standings th { background: #bed9ff; padding: 4px 10px; }
+.standings td { padding: 2px 10px; text-align: right; }
+"""
+
+
+def run(tasks, jobs=None):
+    # Results in task order; tasks of one tournament are handed out in chunks so a worker
+    # keeps reusing that tournament's cached aggregates
+    if jobs == 1:
+        yield from map(render, tasks)
+        return
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(render, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+def write_index(tournament, out_dir, reports):
+    links = ''.join(f'<li><a href="{stem}.html">{html.escape(title)}</a> (<a href="{stem}.json">json</a>)</li>' for stem, title in reports)
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(tournament)} reports</title>'
+                f'<link rel="stylesheet" href="report.css"></head><body><h1>{html.escape(tournament)}</h1><ul>{links}</ul></body></html>')
+
+
+def prepare_output(tournament, result_root):
+    out_dir = os.path.join(result_root, tournament)
+    os.makedirs(out_dir, exist_ok=True)
+    # One copy of plotly.js per tournament folder, so the reports open offline
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(plotly.offline.get_plotlyjs())
+    with open(os.path.join(out_dir, 'report.css'), 'w', encoding='utf-8') as f:
+        f.write(REPORT_CSS)
+    return out_dir
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export static dashboard reports for every tournament, judge and round.")
+    parser.add_argument('tournaments', nargs='*', help="tournaments to export (default: every one found)")
+    parser.add_argument('--by', nargs='+', default=list(SELECTIONS), choices=SELECTIONS, help="report selections (default: all)")
+    parser.add_argument('--jobs', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--all-points', action='store_true', help="draw raw points on small violins, like the dashboard toggle")
+    parser.add_argument('--out', default=RESULT_ROOT)
+    args = parser.parse_args()
+
+    # No reload thread: the export works on the versions loaded here
+    statapp.catalog.watch_interval = None
+    tournaments = args.tournaments or statapp.catalog.names()
+    unknown = [t for t in tournaments if t not in statapp.catalog.names()]
+    if unknown:
+        parser.error(f"unknown tournament(s): {', '.join(unknown)}")
+
+    full_points = ['all'] if args.all_points else None
+    tasks = []
+    for tournament in tournaments:
+        out_dir = prepare_output(tournament, args.out)
+        tasks += [(tournament, stem, title, judges, rounds, full_points, out_dir)
+                  for stem, title, judges, rounds in selections(tournament, args.by)]
+
+    start = time.perf_counter()
+    reports = {tournament: [] for tournament in tournaments}
+    for tournament, stem, title, seconds in run(tasks, args.jobs):
+        reports[tournament].append((stem, title))
+        print(f"{tournament}: {title} ({seconds:.1f} s)")
+
+    for tournament in tournaments:
+        write_index(tournament, os.path.join(args.out, tournament), reports[tournament])
+    print(f"{len(tasks)} reports written to {args.out}/ in {time.perf_counter() - start:.1f} s")
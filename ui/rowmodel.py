@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+# Server-side helpers for the AG Grid infinite row model: the browser only ever
+# receives the block of rows it is currently displaying.
+
+
+def column_sort_key(column, descending=False):
+    if pd.api.types.is_numeric_dtype(column.dtype):
+        values = column.to_numpy(dtype=float)
+    else:
+        codes, _labels = pd.factorize(column, sort=True)
+        values = codes.astype(float)
+        values[codes < 0] = np.nan
+    return -values if descending else values
+
+
+def sorted_rows(frame, rows, sort_model):
+    # Reorder the filtered row positions following AG Grid's sortModel
+    # ([{"colId": ..., "sort": "asc" | "desc"}, ...], first entry wins)
+    if not sort_model or len(rows) == 0:
+        return rows
+    keys = []
+    for item in reversed(sort_model):
+        column = frame[item["colId"]].take(rows)
+        keys.append(column_sort_key(column, descending=item.get("sort") == "desc"))
+    return rows[np.lexsort(keys)]
+
+
+def row_block(frame, rows, request):
+    start = max(int(request.get("startRow") or 0), 0)
+    end = min(int(request.get("endRow") or start), len(rows))
+    block = frame.take(rows[start:end]) if end > start else frame.iloc[0:0]
+    # float32 scores are sent in their shortest decimal form (7.1, not 7.099999904632568)
+    block = block.astype({col: str for col in block.columns if block[col].dtype == np.float32}).astype(
+        {col: float for col in block.columns if block[col].dtype == np.float32})
+    return {"rowData": block.to_dict("records"), "rowCount": int(len(rows))}
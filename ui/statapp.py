@@ -1,368 +1,655 @@
-from dash import Dash, html, dcc, Input, Output, callback
+from dash import Dash, ClientsideFunction, html, dcc, Input, Output, State, callback
 import dash
+import base64
+import json
+import os
+import sys
 import dash_ag_grid as dag
 import pandas as pd
 import plotly.express as px
 import numpy as np
 
-df_long = pd.read_excel('data/intermediate/WT25_notes_long.xlsx')
-df      = pd.read_excel('data/intermediate/WT25_notes_cleaned.xlsx')
-
-app     = Dash(__name__)
+# Shared data helpers live next to the pipeline scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import metrics
+from cache import selection_key
+from catalog import Catalog
+from correlation import leave_one_out_correlations
+from jobs import checkpoint
+from judges import analyze_judges
+from metrics import count_rows, instrument, phase
+from ranking import RANK_LEVEL, rank_spinners
+from rowmodel import row_block, sorted_rows
+from violins import summarize_groups, summary_violin_figure
+
+# Every tournament found under data/intermediate, loaded on first use and reloaded in the
+# background when the pipeline publishes new results
+catalog = Catalog(max_resident=3, cache_bytes=256 * 1024 ** 2, watch_interval=5)
+
+# Figure builds run as background jobs when diskcache is installed, otherwise in the request worker;
+# finished results are shared between workers until the tournament files change. Jobs run on a
+# thread pool in the worker (see jobs.py), so they fill and reuse its selection caches, and a
+# superseded job stops at its next checkpoint. The cache and its manager are created with the app,
+# so importing the callbacks (reports, benchmarks, tests) opens nothing under data/cache.
+try:
+    import diskcache
+    from jobs import ThreadJobManager
+except ImportError:
+    diskcache = None
+
+
+def graph_class(graph_id):
+    return "heatmap-plot" if graph_id in HEATMAP_GRAPHS else "violin-plot"
+
+def background(*graph_ids):
+    # Dash cancels a callback's running job when it is triggered again with a newer selection;
+    # the graphs being rebuilt are dimmed until their job finishes
+    options = {'running': [(Output(graph_id, 'className'), f'{graph_class(graph_id)} graph-running', graph_class(graph_id)) for graph_id in graph_ids]}
+    if diskcache is not None:
+        options['background'] = True
+    return options
 
 
 # Utility functions
-def column_width(col_name):
-    max_len = df_long[col_name].astype(str).map(len).max()
+def column_width(df_long, col_name):
+    # Categoricals are measured on their labels, other columns on a fixed-size row sample
+    column = df_long[col_name]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        values = column.cat.categories.to_series()
+    else:
+        values = column.sample(min(len(column), WIDTH_SAMPLE_ROWS), random_state=0)
+    max_len = values.astype(str).map(len).max() if len(values) else 0
     return max(100, min(max_len * 10 + 20, 300))
 
 def AgGrid_widths(df_long):
     widths = {}
     total = 39
     for col in df_long.columns:
-        widths[col] = column_width(col)
+        widths[col] = column_width(df_long, col)
         total += widths[col]
     widths["_total"] = total
     return widths
 
+def grid_widths(data):
+    return data.cache.get_or_compute(('table', 'column-widths'), lambda: AgGrid_widths(data.df_long))
+
+def grid_style(data=None):
+    width = f'{grid_widths(data).get("_total", 0)}px' if data is not None else "100%"
+    return {"height": "700px", "width": width, "resize": False}
+
+def column_defs(data):
+    widths = grid_widths(data)
+    return [{"field": c, "width": widths.get(c)} for c in data.df_long.columns]
+
+def filtered_long_rows(data, key):
+    checkpoint()
+    with phase('filter'):
+        rows = data.cache.get_or_compute(('rows', 'long', key), lambda: data.filters.indexes(*key))
+    count_rows(len(rows))
+    return rows
+
+def filtered_long(data, key):
+    rows = filtered_long_rows(data, key)
+    with phase('filter'):
+        return data.df_long if len(rows) == len(data.df_long) else data.df_long.take(rows)
+
+def filtered_wide(data, key):
+    checkpoint()
+    with phase('filter'):
+        wide = data.cache.get_or_compute(('table', 'wide', key), lambda: data.wide.frame(data.wide.rows(*key[:3])))
+    count_rows(len(wide))
+    return wide
+
+def filtered_block(data, key):
+    # (performance rows, criteria, score matrix) for the selection, shared by the correlation figures
+    checkpoint()
+    with phase('filter'):
+        block = data.cache.get_or_compute(
+            ('block', 'wide', key),
+            lambda: data.wide.block(data.wide.rows(*key[:3]), data.wide.columns(key[3])),
+        )
+    count_rows(len(block[0]))
+    return block
+
+def aggregate(compute):
+    checkpoint()
+    with phase('aggregate'):
+        return compute()
+
+def violin_name(name, full_points):
+    return f"{name}-all-points" if full_points else name
+
+def round_violin_criteria(criteria):
+    # The usual criteria keep their slots; slots of criteria a tournament does not have take its
+    # other criteria in order, and are left empty (None) when there are none left
+    others = iter([c for c in criteria if c not in ROUND_CRITERIA])
+    return [c if c in criteria else next(others, None) for c in ROUND_CRITERIA]
+
+def figure_json(build):
+    # JSON text of the figure returned by build
+    checkpoint()
+    with phase('figure'):
+        fig = build()
+    checkpoint()
+    with phase('serialize'):
+        return fig.to_json()
+
+def cached_figure(data, name, key, build):
+    # Figures are kept as their JSON text so the byte cap reflects the real payload
+    figure_text = data.cache.get_or_compute(('figure', name, key), lambda: figure_json(build))
+    with phase('serialize'):
+        return json.loads(figure_text)
+
+def violin_figure(source_df, y, x, title, full_points=False):
+    # Raw points (and a client-side KDE) only for small selections; otherwise draw from server-side summaries
+    if full_points and len(source_df) <= FULL_POINTS_LIMIT:
+        fig = px.violin(source_df, y=y, x=x, box=True, points="all", title=title)
+    else:
+        fig = summary_violin_figure(summarize_groups(source_df[y], source_df[x]), x, y, title)
+    return fig.update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+
+def heatmap_figure(table, title):
+    return px.imshow(table, text_auto=".2f", aspect="auto", title=title, color_continuous_scale="Blues").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
+
+def line_figure(source_df, x, y, color, title):
+    return px.line(source_df, x=x, y=y, color=color, title=title).update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+
+def typed_array(values):
+    # Little-endian bytes of a numeric column, decoded into a JS typed array by assets/clientfilters.js
+    values = np.ascontiguousarray(values, dtype=np.asarray(values).dtype.newbyteorder('<'))
+    return {"dtype": f"{values.dtype.kind}{values.dtype.itemsize}", "bdata": base64.b64encode(values.tobytes()).decode('ascii')}
+
+def client_payload(data):
+    # Everything the browser needs to redraw the judge/criterion heatmaps and the round line:
+    # per-row dimension codes and float32 scores, plus empty figures carrying the server styling
+    def build():
+        no_data = pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"])
+        figures = {
+            'mean': heatmap_figure(no_data, JUDGE_MEAN_TITLE),
+            'std': heatmap_figure(no_data, JUDGE_STD_TITLE),
+            'line': line_figure(pd.DataFrame({'Round': [], 'Score': [], 'Criterion': []}), "Round", "Score", "Criterion", ROUND_LINE_TITLE),
+        }
+        return {
+            'tournament': data.name,
+            'version': data.version,
+            'labels': {dim: data.filters.labels[dim] for dim in data.filters.dimensions},
+            'codes': {dim: typed_array(data.filters.codes[dim]) for dim in data.filters.dimensions},
+            'score': typed_array(data.df_long['Score'].to_numpy(dtype=np.float32)),
+            'figures': {name: json.loads(fig.to_json()) for name, fig in figures.items()},
+        }
+    return data.cache.get_or_compute(('client', 'payload'), lambda: aggregate(build))
+
+def criteria_corr_heatmap(criteria, scores):
+    if len(scores) == 0:
+        corr_matrix = pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"])
+    else:
+        corr_matrix = pd.DataFrame(scores, columns=criteria).corr()
+        np.fill_diagonal(corr_matrix.values, np.nan)
+    return heatmap_figure(corr_matrix, "Correlation between Criteria")
 
-# Constants
-ALL_SPINNERS        = sorted(df_long['Spinner'].unique().tolist())
-ALL_JUDGES          = sorted(df_long['Judge'].unique().tolist())
-ALL_CRITERIA        = sorted(df_long['Criterion'].unique().tolist())
-ALL_ROUNDS          = sorted(df_long['Round'].unique().tolist())
-COLUMN_WIDTHS       = AgGrid_widths(df_long)
-
+def criterion_vs_total_excl_heatmap(judge_codes, judges, criteria, scores):
+    if len(scores) == 0:
+        corr_df = pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"])
+        return heatmap_figure(corr_df, "Correlation: Criterion vs Total (excluding that criterion)")
+
+    with phase('aggregate'):
+        corr, low, high, counts = leave_one_out_correlations(scores, judge_codes, len(judges))
+    corr_df = pd.DataFrame(corr, index=judges, columns=criteria)
+    return heatmap_figure(corr_df, "Correlation: Criterion vs Total (excluding that criterion)").update_traces(
+        customdata=np.dstack([low, high, counts]),
+        hovertemplate="Judge: %{y}<br>Criterion: %{x}<br>r = %{z:.2f} (95% CI %{customdata[0]:.2f} to %{customdata[1]:.2f})<br>n = %{customdata[2]}<extra></extra>",
+    )
 
-crit_violin         = px.violin(df_long, y="Score", x="Criterion", box=True, points="all", title="Score Distribution by Criterion").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-judge_violin        = px.violin(df_long, y="Score", x="Judge", box=True, points="all", title="Score Distribution by Judge").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+def criteria_corr_figure(data, key):
+    _rows, criteria, scores = filtered_block(data, key)
+    return criteria_corr_heatmap(criteria, scores)
+
+def criterion_vs_total_figure(data, key):
+    rows, criteria, scores = filtered_block(data, key)
+    judge_codes, judges = data.wide.judge_codes(rows)
+    return criterion_vs_total_excl_heatmap(judge_codes, judges, criteria, scores)
+
+def rank_interval_figure(standings):
+    top = standings.head(SPINNERS_SHOWN)
+    fig = px.scatter(top, x="Spinner", y="Rank", hover_data=["Mean Z-Score", "Mean Total", "Performances"],
+                     title=f"Rank and {int(RANK_LEVEL * 100)}% Bootstrap Rank Interval (top {len(top)})")
+    fig.update_traces(error_y=dict(type="data", symmetric=False, array=top["Rank high"] - top["Rank"], arrayminus=top["Rank"] - top["Rank low"]))
+    return fig.update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(autorange="reversed", showgrid=True, gridcolor="#d9e0e8", zeroline=False)
+
+def progression_figure(ranking):
+    shown = ranking['standings']['Spinner'].head(SPINNERS_SHOWN)
+    table = ranking['progression'].loc[shown].rename_axis("Spinner").rename_axis("Round", axis=1).stack().rename("Round Score").reset_index()
+    return line_figure(table, "Round", "Round Score", "Spinner", f"Round Score Progression (top {len(shown)})").update_traces(mode="lines+markers")
+
+def head_to_head_figure(ranking):
+    shown = ranking['standings']['Spinner'].head(SPINNERS_SHOWN).tolist()
+    if not shown:
+        return heatmap_figure(pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"]), "Head-to-Head Win Share")
+    positions = pd.Index(ranking['spinners']).get_indexer(shown)
+    wins = ranking['wins'][np.ix_(positions, positions)]
+    meetings = ranking['meetings'][np.ix_(positions, positions)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = pd.DataFrame(np.where(meetings > 0, wins / meetings, np.nan), index=shown, columns=shown)
+    return heatmap_figure(share, f"Head-to-Head Win Share, row vs column (top {len(shown)})").update_traces(
+        customdata=np.dstack([wins, meetings]),
+        hovertemplate="%{y} vs %{x}<br>won %{customdata[0]} of %{customdata[1]} shared judge scores<extra></extra>",
+    )
 
+def leniency_figure(analysis):
+    table = analysis['leniency']
+    if table.empty:
+        return heatmap_figure(pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"]), "Judge Leniency: Offset from the Rest of the Panel")
+    # Round offsets pooled over the selected rounds, weighted by their scores
+    pooled = table.assign(Weighted=table['Offset'] * table['Scores']).groupby(['Judge', 'Criterion'], observed=True)[['Weighted', 'Scores', 'Outliers']].sum()
+    offsets = (pooled['Weighted'] / pooled['Scores']).unstack('Criterion')
+    counts = pooled[['Scores', 'Outliers']].unstack('Criterion').reindex(index=offsets.index)
+    return heatmap_figure(offsets, "Judge Leniency: Offset from the Rest of the Panel").update_traces(
+        customdata=np.dstack([counts['Scores'].reindex(columns=offsets.columns), counts['Outliers'].reindex(columns=offsets.columns)]),
+        hovertemplate="Judge: %{y}<br>Criterion: %{x}<br>offset %{z:+.2f}<br>%{customdata[1]} outliers in %{customdata[0]} scores<extra></extra>",
+    ).update_layout(coloraxis=dict(colorscale="RdBu", cmid=0))
+
+def agreement_figure(analysis):
+    table = analysis['agreement']
+    if table.empty:
+        return heatmap_figure(pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"]), "Inter-Judge Agreement (ICC)")
+    overall = analysis['criterion_agreement'].set_index('Criterion')
+    icc = table.pivot(index='Criterion', columns='Round', values='ICC').assign(All=overall['ICC'])
+    kendall = table.pivot(index='Criterion', columns='Round', values='Kendall W').assign(All=overall['Kendall W'])
+    icc.columns = [str(c) for c in icc.columns]
+    return heatmap_figure(icc, "Inter-Judge Agreement (ICC) per Criterion/Round").update_traces(
+        customdata=kendall.to_numpy()[..., None],
+        hovertemplate="Criterion: %{y}<br>Round: %{x}<br>ICC = %{z:.2f}<br>Kendall's W = %{customdata[0]:.2f}<extra></extra>",
+    )
 
-judge_violin_total      = px.violin(df, y="Total", x="Judge", box=True, points="all", title="Score Distribution by Judge").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-heatmap_crit_judge_mean = px.imshow(df_long.pivot_table(index="Judge", columns="Criterion", values="Score", aggfunc="mean"), text_auto=".2f", aspect="auto", title = "Average Score per Judge/Criterion",color_continuous_scale="Blues").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
-heatmap_crit_judge_std  = px.imshow(df_long.pivot_table(index="Judge", columns="Criterion", values="Score", aggfunc="std"), text_auto=".2f", aspect="auto", title ="Standard Deviation per Judge/Criterion",color_continuous_scale="Blues").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
 
-def criteria_corr_heatmap(source_df):
-    wide = source_df.pivot_table(
-        index=["Spinner", "Round", "Judge"],
-        columns="Criterion",
-        values="Score",
-        aggfunc="mean",
-    )
-    corr_matrix = wide.corr()
-    if corr_matrix.empty:
-        corr_matrix = pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"])
-    else:
-        np.fill_diagonal(corr_matrix.values, np.nan)
-    return px.imshow(
-        corr_matrix,
-        text_auto=".2f",
-        aspect="auto",
-        title="Correlation between Criteria",
-        color_continuous_scale="Blues",
-    ).update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
-
-def criterion_vs_total_excl_heatmap(source_df):
-    wide = source_df.pivot_table(
-        index=["Spinner", "Round", "Judge"],
-        columns="Criterion",
-        values="Score",
-        aggfunc="mean",
-    )
-    if wide.empty:
-        corr_df = pd.DataFrame([[np.nan]], index=["No data"], columns=["No data"])
-    else:
-        total_all = wide.sum(axis=1)
-        rows = []
-        judges = []
-        for judge, group in wide.groupby(level="Judge"):
-            group_total = total_all.loc[group.index]
-            judge_corrs = []
-            for col in group.columns:
-                total_without = group_total - group[col]
-                judge_corrs.append(total_without.corr(group[col]))
-            rows.append(judge_corrs)
-            judges.append(judge)
-        corr_df = pd.DataFrame(rows, index=judges, columns=wide.columns)
-    return px.imshow(
-        corr_df,
-        text_auto=".2f",
-        aspect="auto",
-        title="Correlation: Criterion vs Total (excluding that criterion)",
-        color_continuous_scale="Blues",
-    ).update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
-
-heatmap_crit_correlation = criteria_corr_heatmap(df_long)
-crit_total_corr = criterion_vs_total_excl_heatmap(df_long)
-
-
-df_round_crit = df_long.groupby(['Round', 'Criterion'], as_index=False)['Score'].mean()
-
-round_line_crit = px.line(df_round_crit, x="Round", y="Score", color="Criterion", title="Score per Criterion by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-round_violin_total  = px.violin(df, y="Total", x="Round", box=True, points="all", title="Total Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-round_violin_constr = px.violin(df, y="Construction", x="Round", box=True, points="all", title="Construction Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-round_violin_creat  = px.violin(df, y="Creativity", x="Round", box=True, points="all", title="Creativity Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-round_violin_diff   = px.violin(df, y="Difficulty", x="Round", box=True, points="all", title="Difficulty Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-round_violin_exe    = px.violin(df, y="Execution", x="Round", box=True, points="all", title="Execution Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+# Constants
+GRID_BLOCK_SIZE     = 100
+FULL_POINTS_LIMIT   = 5000
+DATA_POLL_SECONDS   = 10
+WIDTH_SAMPLE_ROWS   = 1000
+SPINNERS_SHOWN      = 20
+CLIENT_FILTERS      = os.environ.get('TOURNAMENT_CLIENT_FILTERS') == '1'
+CLIENT_ROWS_LIMIT   = 250_000
+JUDGE_MEAN_TITLE    = "Average Score per Judge/Criterion"
+JUDGE_STD_TITLE     = "Standard Deviation per Judge/Criterion"
+ROUND_LINE_TITLE    = "Score per Criterion by Round"
+OUTLIERS_SHOWN      = 200
+ROUND_VIOLIN_GRAPHS = ['round_violin_constr', 'round_violin_creat', 'round_violin_diff', 'round_violin_exe']
+ROUND_CRITERIA      = ['Construction', 'Creativity', 'Difficulty', 'Execution']
+HEATMAP_GRAPHS      = ('heatmap-judge-criteria-mean', 'heatmap-judge-criteria-std', 'judge-leniency', 'judge-agreement', 'heatmap-criteria-correlation', 'criteria-total-corr', 'spinner-head-to-head')
+STANDINGS_COLUMNS   = [
+    {"field": "Rank", "width": 80},
+    {"field": "Spinner", "width": 150},
+    {"field": "Mean Z-Score", "width": 130},
+    {"field": "Rank low", "width": 100},
+    {"field": "Rank high", "width": 100},
+    {"field": "Total rank", "width": 100},
+    {"field": "Mean Total", "width": 120},
+    {"field": "Last Round", "width": 110},
+    {"field": "Performances", "width": 125},
+]
+OUTLIER_COLUMNS     = [
+    {"field": "Spinner", "width": 150},
+    {"field": "Round", "width": 90},
+    {"field": "Judge", "width": 120},
+    {"field": "Criterion", "width": 130},
+    {"field": "Score", "width": 90},
+    {"field": "Panel Mean", "width": 120},
+    {"field": "Deviation", "width": 110},
+]
+EMPTY_FIGURE        = {"layout": {"plot_bgcolor": "#edf5ff", "paper_bgcolor": "#edf5ff", "xaxis": {"visible": False}, "yaxis": {"visible": False}}}
 
 
 # Layout
-app.layout = html.Div([
-  # Header Section
-    html.Div([
-       html.H1("Penspinning Tournament Analysis", className="header-title"),
-        html.Div(
-            [
-                html.Div(
-                    [
-                        html.Button(
-                            "Reset Filters",
-                            id='reset-filters',
-                            n_clicks=0,
-                            className="btn"
-                        ),
-                        html.Button(
-                            "Select All",
-                            id='select-all',
-                            n_clicks=0,
-                            className="btn"
-                        ),
-                    ],
-                    className="filters-actions"
-                ),
-                html.Div(
-                    [
-                        html.Div(
-                            dcc.Dropdown(
-                                id='spinner-dropdown',
-                                options=ALL_SPINNERS,
-                                multi=True,
-                                placeholder="Select Spinners"
+def serve_layout():
+    # No data is touched here: filter options, grid columns and figures are filled in by the
+    # callbacks, so the first request loads the tournament and graphs start as placeholders
+    return html.Div([
+      # Header Section
+        html.Div([
+           html.Div(
+                [
+                    html.H1("Penspinning Tournament Analysis", className="header-title"),
+                    dcc.Dropdown(
+                        id='tournament-dropdown',
+                        options=catalog.names(),
+                        value=catalog.default(),
+                        clearable=False,
+                        className="tournament-dropdown"
+                    ),
+                ],
+                className="title-row"
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Button(
+                                "Reset Filters",
+                                id='reset-filters',
+                                n_clicks=0,
+                                className="btn"
                             ),
-                            className="dropdown"
-                        ),
-                        html.Div(
-                            dcc.Dropdown(
-                                id='judge-dropdown',
-                                options=ALL_JUDGES,
-                                multi=True,
-                                placeholder="Select Judges"
+                            html.Button(
+                                "Select All",
+                                id='select-all',
+                                n_clicks=0,
+                                className="btn"
                             ),
-                            className="dropdown"
-                        ),
-                        html.Div(
-                            dcc.Dropdown(
-                                id='round-dropdown',
-                                options=ALL_ROUNDS,
-                                multi=True,
-                                placeholder="Select Rounds"
+                            dcc.Checklist(
+                                id='full-points',
+                                options=[{"label": "Show all points", "value": "all"}],
+                                value=[],
+                                className="points-toggle"
                             ),
-                            className="dropdown"
-                        ),
-                        html.Div(
-                            dcc.Dropdown(
-                                id='criteria-dropdown',
-                                options=ALL_CRITERIA,
-                                value=['Construction', 'Creativity', 'Deduction', 'Difficulty', 'Execution'],
-                                multi=True,
-                                placeholder="Select Criteria"
+                        ],
+                        className="filters-actions"
+                    ),
+                    html.Div(
+                        [
+                            html.Div(
+                                dcc.Dropdown(
+                                    id='spinner-dropdown',
+                                    options=[],
+                                    multi=True,
+                                    placeholder="Select Spinners"
+                                ),
+                                className="dropdown"
                             ),
-                            className="dropdown"
-                        ),
-                    ],
-                    className="filters-grid"
-                ),
-            ],
-            className="filters-row"
-        ),
-        html.Div(
-            [
-                html.Button(
-                    "OVERVIEW",
-                    id='overview-btn',
-                    n_clicks=0,
-                    className="tab-btn"
-                ),
-                html.Button(
-                    "JUDGES",
-                    id='judges-btn',
-                    n_clicks=0,
-                    className="tab-btn"
-                ),
-                html.Button(
-                    "CRITERIA",
-                    id='criteria-btn',
-                    n_clicks=0,
-                    className="tab-btn"
-                ),
-                html.Button(
-                    "ROUNDS",
-                    id='rounds-btn',
-                    n_clicks=0,
-                    className="tab-btn"
-                ),
-                html.Button(
-                    "SPINNERS",
-                    id='spinners-btn',
-                    n_clicks=0,
-                    className="tab-btn"
-                ),
-            ],
-            className="nav-row"
-        ),
-    ], className="header-section"),
-    dcc.Store(id="active-tab", data="overview"),
-
-    # Overview tab
-    html.Div([
-         html.Div([
-             dag.AgGrid(
-                 id='data-table',
-                 rowData=df_long.to_dict('records'),
-                 columnDefs=[{"field": c, "width": COLUMN_WIDTHS.get(c)} for c in df_long.columns],
-                 style={
-                     "height": "700px",
-                     "width": f'{COLUMN_WIDTHS.get("_total", 0)}px',
-                     "resize": False,
-                 },
-                 className="ag-theme-alpine aggrid"
-             ),
+                            html.Div(
+                                dcc.Dropdown(
+                                    id='judge-dropdown',
+                                    options=[],
+                                    multi=True,
+                                    placeholder="Select Judges"
+                                ),
+                                className="dropdown"
+                            ),
+                            html.Div(
+                                dcc.Dropdown(
+                                    id='round-dropdown',
+                                    options=[],
+                                    multi=True,
+                                    placeholder="Select Rounds"
+                                ),
+                                className="dropdown"
+                            ),
+                            html.Div(
+                                dcc.Dropdown(
+                                    id='criteria-dropdown',
+                                    options=[],
+                                    multi=True,
+                                    placeholder="Select Criteria"
+                                ),
+                                className="dropdown"
+                            ),
+                        ],
+                        className="filters-grid"
+                    ),
+                ],
+                className="filters-row"
+            ),
+            html.Div(
+                [
+                    html.Button(
+                        "OVERVIEW",
+                        id='overview-btn',
+                        n_clicks=0,
+                        className="tab-btn"
+                    ),
+                    html.Button(
+                        "JUDGES",
+                        id='judges-btn',
+                        n_clicks=0,
+                        className="tab-btn"
+                    ),
+                    html.Button(
+                        "CRITERIA",
+                        id='criteria-btn',
+                        n_clicks=0,
+                        className="tab-btn"
+                    ),
+                    html.Button(
+                        "ROUNDS",
+                        id='rounds-btn',
+                        n_clicks=0,
+                        className="tab-btn"
+                    ),
+                    html.Button(
+                        "SPINNERS",
+                        id='spinners-btn',
+                        n_clicks=0,
+                        className="tab-btn"
+                    ),
+                ],
+                className="nav-row"
+            ),
+        ], className="header-section"),
+        dcc.Store(id="active-tab", data="overview-btn"),
+        dcc.Store(id="data-table-selection"),
+        dcc.Store(id="data-version", data=catalog.versions()),
+        dcc.Interval(id="data-poll", interval=DATA_POLL_SECONDS * 1000),
+        dcc.Store(id="overview-request"),
+        dcc.Store(id="judges-request"),
+        dcc.Store(id="criteria-request"),
+        dcc.Store(id="rounds-request"),
+        dcc.Store(id="spinners-request"),
+        dcc.Store(id="client-data"),
+        dcc.Store(id="judges-server-request"),
+        dcc.Store(id="rounds-server-request"),
+
+        # Overview tab
+        html.Div([
+             html.Div([
+                 dag.AgGrid(
+                     id='data-table',
+                     rowModelType="infinite",
+                     columnDefs=[],
+                     style=grid_style(),
+                     dashGridOptions={
+                         "cacheBlockSize": GRID_BLOCK_SIZE,
+                         "maxBlocksInCache": 10,
+                         "infiniteInitialRowCount": GRID_BLOCK_SIZE,
+                     },
+                     className="ag-theme-alpine aggrid"
+                 ),
+                 dcc.Graph(
+                     figure=EMPTY_FIGURE,
+                     id ='crit-violin',
+                     style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                     className="violin-plot"
+                 ),
+             ], style={"display": "flex", "flexWrap": "wrap", "gap": "10px", "justifyContent": "center", "marginBottom": "20px","marginTop": "10px"}),
              dcc.Graph(
-                 figure=crit_violin,
-                 id ='crit-violin',
-                 style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                 figure=EMPTY_FIGURE,
+                 id ='judge-violin',
+                 style={"width": "100%", "height": "700px"},
                  className="violin-plot"
              ),
-         ], style={"display": "flex", "flexWrap": "wrap", "gap": "10px", "justifyContent": "center", "marginBottom": "20px","marginTop": "10px"}),
-         dcc.Graph(
-             figure=judge_violin,
-             id ='judge-violin',
-             style={"width": "100%", "height": "700px"},
-             className="violin-plot"
-         ),
-     ], id="overview-section", className="body-section"),
-
-    # Judges tab
-    html.Div([
-        dcc.Graph(
-            figure=judge_violin,
-            id ='judge-violin-notes',
-            style={"width": "100%", "height": "700px"},
-            className="violin-plot"
-        ),
-        html.Div(
-            [
-            dcc.Graph(
-                figure=heatmap_crit_judge_mean,
-                id ='heatmap-judge-criteria-mean',
-                style={"height": "700px"},
-                className="heatmap-plot"
-            ),
-            dcc.Graph(
-                figure=heatmap_crit_judge_std,
-                id ='heatmap-judge-criteria-std',
-                style={"height": "700px"},
-                className="heatmap-plot"
-            ),
-        ],
-        className="heatmap-row"
-        ),
-
-        # Heatmap judge criteria bias
-        dcc.Graph(
-            figure=judge_violin_total,
-            id ='judge-violin-total',
-            style={"width": "100%", "height": "700px"},
-            className="violin-plot"
-        ),
-    ], id="judges-section", className="body-section"),
-
-    # Criteria tab
-    html.Div([
+         ], id="overview-section", className="body-section"),
+
+        # Judges tab
         html.Div([
             dcc.Graph(
-                figure=crit_violin,
-                id ='criteria-violin',
-                style={"height": "1000px"},
+                figure=EMPTY_FIGURE,
+                id ='judge-violin-notes',
+                style={"width": "100%", "height": "700px"},
                 className="violin-plot"
             ),
-            html.Div([
+            html.Div(
+                [
                 dcc.Graph(
-                    figure=heatmap_crit_correlation,
-                    id ='heatmap-criteria-correlation',
-                    style={"height": "500px"},
+                    figure=EMPTY_FIGURE,
+                    id ='heatmap-judge-criteria-mean',
+                    style={"height": "700px"},
                     className="heatmap-plot"
                 ),
                 dcc.Graph(
-                    figure=crit_total_corr,
-                    id="criteria-total-corr",
-                    style={"height": "500px"},
+                    figure=EMPTY_FIGURE,
+                    id ='heatmap-judge-criteria-std',
+                    style={"height": "700px"},
                     className="heatmap-plot"
                 ),
-            ],className= "filters-actions"),
-        ],style={"display": "flex", "flexWrap": "wrap", "gap": "10px", "justifyContent": "center", "marginBottom": "20px","marginTop": "10px"})
-    ], id="criteria-section", className="body-section"),
-
-    # Rounds tab
-    html.Div([
-        html.Div(
-        [
-            dcc.Graph(
-                figure=round_violin_total,
-                id ='round_violin_total',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
-                className="violin-plot"
+            ],
+            className="heatmap-row"
             ),
-            dcc.Graph(
-                figure=round_line_crit,
-                id ='round_line_crit',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
-                className="violin-plot"
+            html.Div(
+                [
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='judge-leniency',
+                    style={"height": "700px"},
+                    className="heatmap-plot"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='judge-agreement',
+                    style={"height": "700px"},
+                    className="heatmap-plot"
+                ),
+            ],
+            className="heatmap-row"
             ),
-        ],
-        className="heatmap-row"
-        ),
-        html.Div(
-        [
+            html.Div([
+                dag.AgGrid(
+                    id='judge-outliers',
+                    rowData=[],
+                    columnDefs=OUTLIER_COLUMNS,
+                    style={"height": "500px", "width": f"{sum(c['width'] for c in OUTLIER_COLUMNS) + 40}px"},
+                    className="ag-theme-alpine aggrid"
+                ),
+            ], style={"display": "flex", "justifyContent": "center", "marginBottom": "20px"}),
+
+            # Heatmap judge criteria bias
             dcc.Graph(
-                figure=round_violin_constr,
-                id ='round_violin_constr',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                figure=EMPTY_FIGURE,
+                id ='judge-violin-total',
+                style={"width": "100%", "height": "700px"},
                 className="violin-plot"
             ),
-            dcc.Graph(
-                figure=round_violin_creat,
-                id ='round_violin_creat',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
-                className="violin-plot"
+        ], id="judges-section", className="body-section"),
+
+        # Criteria tab
+        html.Div([
+            html.Div([
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='criteria-violin',
+                    style={"height": "1000px"},
+                    className="violin-plot"
+                ),
+                html.Div([
+                    dcc.Graph(
+                        figure=EMPTY_FIGURE,
+                        id ='heatmap-criteria-correlation',
+                        style={"height": "500px"},
+                        className="heatmap-plot"
+                    ),
+                    dcc.Graph(
+                        figure=EMPTY_FIGURE,
+                        id="criteria-total-corr",
+                        style={"height": "500px"},
+                        className="heatmap-plot"
+                    ),
+                ],className= "filters-actions"),
+            ],style={"display": "flex", "flexWrap": "wrap", "gap": "10px", "justifyContent": "center", "marginBottom": "20px","marginTop": "10px"})
+        ], id="criteria-section", className="body-section"),
+
+        # Rounds tab
+        html.Div([
+            html.Div(
+            [
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_violin_total',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_line_crit',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+            ],
+            className="heatmap-row"
             ),
-        ],
-        className="heatmap-row"
-        ),
-        html.Div(
-        [
-            dcc.Graph(
-                figure=round_violin_diff,
-                id ='round_violin_diff',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
-                className="violin-plot"
+            html.Div(
+            [
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_violin_constr',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_violin_creat',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+            ],
+            className="heatmap-row"
             ),
-            dcc.Graph(
-                figure=round_violin_exe,
-                id ='round_violin_exe',
-                style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
-                className="violin-plot"
+            html.Div(
+            [
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_violin_diff',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id ='round_violin_exe',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+            ],
+            className="heatmap-row"
+            ),
+        ], id="rounds-section", className="body-section"),
+
+        # Spinners tab
+        html.Div([
+            html.Div([
+                dag.AgGrid(
+                    id='spinner-standings',
+                    rowData=[],
+                    columnDefs=STANDINGS_COLUMNS,
+                    style={"height": "700px", "width": f"{sum(c['width'] for c in STANDINGS_COLUMNS) + 40}px"},
+                    className="ag-theme-alpine aggrid"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id='spinner-rank-intervals',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+            ], style={"display": "flex", "flexWrap": "wrap", "gap": "10px", "justifyContent": "center", "marginBottom": "20px","marginTop": "10px"}),
+            html.Div(
+            [
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id='spinner-progression',
+                    style={"flex": "1 1 400px", "minWidth": "300px", "height": "700px"},
+                    className="violin-plot"
+                ),
+                dcc.Graph(
+                    figure=EMPTY_FIGURE,
+                    id='spinner-head-to-head',
+                    style={"height": "700px"},
+                    className="heatmap-plot"
+                ),
+            ],
+            className="heatmap-row"
             ),
-        ],
-        className="heatmap-row"
-        ),
-    ], id="rounds-section", className="body-section"),
+        ], id="spinners-section", className="body-section"),
 
-    # Spinners tab
-    html.Div([
-        html.H2("Spinners Analysis Coming Soon!", style={"textAlign": "center", "marginTop": "50px"})
-    ], id="spinners-section", className="body-section"),
-])
+        # Callback metrics, only with TOURNAMENT_METRICS=1
+        *metrics.panel(),
+    ])
 
 ## Header section callbacks
 @callback(
@@ -371,20 +658,55 @@ app.layout = html.Div([
     Output('round-dropdown', 'value'),
     Output('criteria-dropdown', 'value'),
     Input('reset-filters', 'n_clicks'),
-    Input('select-all', 'n_clicks')
+    Input('select-all', 'n_clicks'),
+    Input('tournament-dropdown', 'value')
 )
-def control_filters(_n_clicks, _m_clicks):
+def control_filters(_n_clicks, _m_clicks, tournament):
     ctx = dash.callback_context
 
-    if not ctx.triggered:
-        return dash.no_update
-
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+    button_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
+    data = catalog.get(tournament)
 
     if button_id == 'reset-filters':
         return None, None, None, None
     elif button_id == 'select-all':
-        return ALL_SPINNERS, ALL_JUDGES, ALL_ROUNDS, ALL_CRITERIA
+        return data.spinners, data.judges, data.rounds, data.criteria
+    else:
+        # Page load or another tournament: clear the filters, keep every criterion selected
+        return None, None, None, data.criteria
+
+@callback(
+    Output('spinner-dropdown', 'options'),
+    Output('judge-dropdown', 'options'),
+    Output('round-dropdown', 'options'),
+    Output('criteria-dropdown', 'options'),
+    Output('data-table', 'columnDefs'),
+    Output('data-table', 'style'),
+    Input('tournament-dropdown', 'value'),
+    Input('data-version', 'data'),
+)
+def update_filter_options(tournament, _version):
+    data = catalog.get(tournament)
+    return data.spinners, data.judges, data.rounds, data.criteria, column_defs(data), grid_style(data)
+
+# Clients learn about newly published results (and new tournaments) by polling the published
+# versions; a changed version re-requests the visible tab's figures and the grid rows
+@callback(
+    Output('data-version', 'data'),
+    Output('tournament-dropdown', 'options'),
+    Input('data-poll', 'n_intervals'),
+    State('tournament-dropdown', 'value'),
+    State('data-version', 'data'),
+    prevent_initial_call=True
+)
+def poll_data_version(_n_intervals, tournament, known_versions):
+    versions = catalog.versions()
+    if versions == known_versions:
+        return dash.no_update, dash.no_update
+    # The worker answering the poll swaps in the new version now rather than on its watcher's next tick
+    catalog.refresh(tournament or catalog.default())
+    names = sorted(versions)
+    return versions, names if names != sorted(known_versions or {}) else dash.no_update
 
 
 ## Tab navigation callbacks
@@ -449,50 +771,137 @@ def render_tabs(active_tab):
         tab_class("spinners-btn"),
     )
 
+# A tab's figures are requested only while the tab is visible, and only when the selection
+# differs from the one they were last drawn for; hidden tabs stay stale until opened
+for tab in ('overview', 'judges', 'criteria', 'rounds', 'spinners'):
+    dash.clientside_callback(
+        """
+        function (active_tab, tournament, spinners, judges, rounds, criteria, full_points, version, previous) {
+            if (active_tab !== '%s-btn') {
+                return window.dash_clientside.no_update;
+            }
+            const request = JSON.stringify([tournament, spinners, judges, rounds, criteria, full_points, version ? version[tournament] : null]);
+            return request === previous ? window.dash_clientside.no_update : request;
+        }
+        """ % tab,
+        Output(f'{tab}-request', 'data'),
+        Input('active-tab', 'data'),
+        Input('tournament-dropdown', 'value'),
+        Input('spinner-dropdown', 'value'),
+        Input('judge-dropdown', 'value'),
+        Input('round-dropdown', 'value'),
+        Input('criteria-dropdown', 'value'),
+        Input('full-points', 'value'),
+        Input('data-version', 'data'),
+        State(f'{tab}-request', 'data'),
+    )
+
+
+# Client-side filtering mode (TOURNAMENT_CLIENT_FILTERS=1): tournaments up to CLIENT_ROWS_LIMIT
+# rows are sent to the browser once per version as typed arrays, and the judge/criterion
+# heatmaps and the round line are re-aggregated there on every filter change. Requests the
+# browser cannot answer (mode off, large or not yet loaded tournament) are passed on to the
+# server callbacks; violins, correlations and spinner rankings always run on the server.
+if CLIENT_FILTERS:
+    @callback(
+        Output('client-data', 'data'),
+        Input('tournament-dropdown', 'value'),
+        Input('data-version', 'data'),
+        State('client-data', 'data'),
+    )
+    @instrument
+    def update_client_data(tournament, _version, current):
+        data = catalog.get(tournament)
+        if current and current['tournament'] == data.name and current['version'] == data.version:
+            return dash.no_update
+        if len(data.df_long) > CLIENT_ROWS_LIMIT:
+            return None
+        return client_payload(data)
+
+dash.clientside_callback(
+    ClientsideFunction(namespace='tournament', function_name='judgeHeatmaps'),
+    Output('heatmap-judge-criteria-mean', 'figure', allow_duplicate=True),
+    Output('heatmap-judge-criteria-std', 'figure', allow_duplicate=True),
+    Output('judges-server-request', 'data'),
+    Input('judges-request', 'data'),
+    State('client-data', 'data'),
+    prevent_initial_call=True,
+)
+dash.clientside_callback(
+    ClientsideFunction(namespace='tournament', function_name='roundLine'),
+    Output('round_line_crit', 'figure', allow_duplicate=True),
+    Output('rounds-server-request', 'data'),
+    Input('rounds-request', 'data'),
+    State('client-data', 'data'),
+    prevent_initial_call=True,
+)
+
 
 ## Overview tab callbacks
 @callback(
-    Output('data-table', 'rowData'),
+    Output('data-table', 'getRowsResponse'),
+    Input('data-table', 'getRowsRequest'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value')
+)
+@instrument
+def update_table_overview(request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria):
+    if request is None:
+        return dash.no_update
+
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+    sort_model = tuple((item["colId"], item.get("sort")) for item in request.get("sortModel") or [])
+    rows = data.cache.get_or_compute(
+        ('rows', 'grid', key, sort_model),
+        lambda: aggregate(lambda: sorted_rows(data.df_long, filtered_long_rows(data, key), request.get("sortModel"))),
+    )
+    with phase('serialize'):
+        return row_block(data.df_long, rows, request)
+
+# Tournament, dropdown and data version changes drop the grid's cached blocks so it requests them again
+dash.clientside_callback(
+    """
+    function (tournament, spinners, judges, rounds, criteria, version) {
+        try {
+            dash_ag_grid.getApi('data-table').purgeInfiniteCache();
+        } catch (e) {}
+        return [tournament, spinners, judges, rounds, criteria, version];
+    }
+    """,
+    Output('data-table-selection', 'data'),
+    Input('tournament-dropdown', 'value'),
     Input('spinner-dropdown', 'value'),
     Input('judge-dropdown', 'value'),
     Input('round-dropdown', 'value'),
-    Input('criteria-dropdown', 'value')
+    Input('criteria-dropdown', 'value'),
+    Input('data-version', 'data'),
+    prevent_initial_call=True,
 )
-def update_table_overview(selected_spinners, selected_judges, selected_rounds, selected_criteria):
-    filtered_df = df_long.copy()
-
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-    return filtered_df.to_dict('records')
 
 @callback(
     Output('crit-violin', 'figure'),
     Output('judge-violin', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
-    Input('criteria-dropdown', 'value')
+    Input('overview-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    State('full-points', 'value'),
+    prevent_initial_call=True,
+    **background('crit-violin', 'judge-violin'),
 )
-def update_violin_overview(selected_spinners, selected_judges, selected_rounds, selected_criteria):
-    filtered_df = df_long.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-
-    fig_crit = px.violin(filtered_df, y="Score", x="Criterion", box=True, points="all", title="Score Distribution by Criterion").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_judge = px.violin(filtered_df, y="Score", x="Judge", box=True, points="all", title="Score Distribution by Judge").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+@instrument
+def update_violin_overview(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria, full_points):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    fig_crit = cached_figure(data, violin_name('crit-violin', full_points), key, lambda: violin_figure(filtered_long(data, key), "Score", "Criterion", "Score Distribution by Criterion", bool(full_points)))
+    fig_judge = cached_figure(data, violin_name('judge-violin', full_points), key, lambda: violin_figure(filtered_long(data, key), "Score", "Judge", "Score Distribution by Judge", bool(full_points)))
 
     return fig_crit, fig_judge
 
@@ -500,97 +909,137 @@ def update_violin_overview(selected_spinners, selected_judges, selected_rounds,
 ## Judges tab callbacks
 @callback(
     Output('judge-violin-notes', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
-    Input('criteria-dropdown', 'value')
+    Input('judges-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    State('full-points', 'value'),
+    prevent_initial_call=True,
+    **background('judge-violin-notes'),
 )
-def update_violin_notes_judge(selected_spinners, selected_judges, selected_rounds, selected_criteria):
-    filtered_df = df_long.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-
-    fig_judge = px.violin(filtered_df, y="Score", x="Judge", box=True, points="all", title="Score Distribution by Judge").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+@instrument
+def update_violin_notes_judge(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria, full_points):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    fig_judge = cached_figure(data, violin_name('judge-violin', full_points), key, lambda: violin_figure(filtered_long(data, key), "Score", "Judge", "Score Distribution by Judge", bool(full_points)))
 
     return fig_judge
 
 @callback(
     Output('judge-violin-total', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
+    Input('judges-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('full-points', 'value'),
+    prevent_initial_call=True,
+    **background('judge-violin-total'),
 )
-def update_violin_total_judge(selected_spinners, selected_judges, selected_rounds):
-    filtered_df = df.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-
-    fig_judge_total = px.violin(filtered_df, y="Total", x="Judge", box=True, points="all", title="Total Score Distribution by Judge").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+@instrument
+def update_violin_total_judge(_request, tournament, selected_spinners, selected_judges, selected_rounds, full_points):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds)
+
+    fig_judge_total = cached_figure(data, violin_name('judge-violin-total', full_points), key, lambda: violin_figure(filtered_wide(data, key), "Total", "Judge", "Total Score Distribution by Judge", bool(full_points)))
 
     return fig_judge_total
 
 @callback(
     Output('heatmap-judge-criteria-mean', 'figure'),
     Output('heatmap-judge-criteria-std', 'figure'),
-    Input('judge-dropdown', 'value'),
-    Input('criteria-dropdown', 'value'),
-    Input('spinner-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
+    Input('judges-server-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    prevent_initial_call=True,
+    **background('heatmap-judge-criteria-mean', 'heatmap-judge-criteria-std'),
 )
-def update_heatmaps_criteria_judge(selected_judge, selected_criteria, selected_spinners, selected_rounds):
-    filtered_df = df_long.copy() 
-    
-    if selected_judge:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judge)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-
-    heatmap_mean    = px.imshow(filtered_df.pivot_table(index="Judge", columns="Criterion", values="Score", aggfunc="mean"), text_auto=".2f", aspect="auto", title ="Average Score per Judge/Criterion",color_continuous_scale="Blues").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
-    heatmap_std     = px.imshow(filtered_df.pivot_table(index="Judge", columns="Criterion", values="Score", aggfunc="std"), text_auto=".2f", aspect="auto", title ="Standard Deviation per Judge/Criterion",color_continuous_scale="Blues").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff", xaxis_title=None, yaxis_title=None)
+@instrument
+def update_heatmaps_criteria_judge(_request, tournament, selected_judge, selected_criteria, selected_spinners, selected_rounds):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judge, selected_rounds, selected_criteria)
+
+    # Summed from the score cube, no pass over the filtered rows
+    def judge_criterion_table(aggfunc):
+        return data.cache.get_or_compute(
+            ('table', f'judge-criterion-{aggfunc}', key),
+            lambda: aggregate(lambda: data.cube.stats(('Judge', 'Criterion'), *key).pivot(index="Judge", columns="Criterion", values=aggfunc)),
+        )
+
+    heatmap_mean    = cached_figure(data, 'heatmap-judge-criteria-mean', key, lambda: heatmap_figure(judge_criterion_table("mean"), JUDGE_MEAN_TITLE))
+    heatmap_std     = cached_figure(data, 'heatmap-judge-criteria-std', key, lambda: heatmap_figure(judge_criterion_table("std"), JUDGE_STD_TITLE))
     return heatmap_mean, heatmap_std
 
+@callback(
+    Output('judge-leniency', 'figure'),
+    Output('judge-agreement', 'figure'),
+    Output('judge-outliers', 'rowData'),
+    Input('judges-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    prevent_initial_call=True,
+    **background('judge-leniency', 'judge-agreement'),
+)
+@instrument
+def update_judge_analytics(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    # Agreement, leniency and outliers of every judge, criterion and round at once. Each score is
+    # compared with its whole panel, so the analysis ignores the judge filter (one entry serves
+    # every judge selection); leniency and outliers are then narrowed to the selected judges
+    panel_key = (key[0], (), key[2], key[3])
+    analysis = data.cache.get_or_compute(
+        ('table', 'judge-analytics', panel_key),
+        lambda: aggregate(lambda: analyze_judges(filtered_long(data, panel_key))),
+    )
+    if key[1]:
+        analysis = data.cache.get_or_compute(('table', 'judge-analytics', key), lambda: dict(
+            analysis,
+            leniency=analysis['leniency'][analysis['leniency']['Judge'].isin(key[1])],
+            outliers=analysis['outliers'][analysis['outliers']['Judge'].isin(key[1])].reset_index(drop=True),
+        ))
+    with phase('serialize'):
+        outliers = analysis['outliers'].head(OUTLIERS_SHOWN).round({'Panel Mean': 2, 'Deviation': 2}).to_dict('records')
+
+    fig_leniency = cached_figure(data, 'judge-leniency', key, lambda: leniency_figure(analysis))
+    fig_agreement = cached_figure(data, 'judge-agreement', key, lambda: agreement_figure(analysis))
+
+    return fig_leniency, fig_agreement, outliers
+
 
 ## Criteria tab callbacks
 @callback(
     Output('criteria-violin', 'figure'),
     Output('heatmap-criteria-correlation', 'figure'),
     Output('criteria-total-corr', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
-    Input('criteria-dropdown', 'value')
+    Input('criteria-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    State('full-points', 'value'),
+    prevent_initial_call=True,
+    **background('criteria-violin', 'heatmap-criteria-correlation', 'criteria-total-corr'),
 )
-def update_criteria_plot(selected_spinners, selected_judges, selected_rounds, selected_criteria):
-    filtered_df = df_long.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-
-    fig_crit = px.violin(filtered_df, y="Score", x="Criterion", box=True, points="all", title="Score Distribution by Criterion").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_corr = criteria_corr_heatmap(filtered_df)
-    fig_total_corr = criterion_vs_total_excl_heatmap(filtered_df)
+@instrument
+def update_criteria_plot(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria, full_points):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    fig_crit = cached_figure(data, violin_name('crit-violin', full_points), key, lambda: violin_figure(filtered_long(data, key), "Score", "Criterion", "Score Distribution by Criterion", bool(full_points)))
+    fig_corr = cached_figure(data, 'heatmap-criteria-correlation', key, lambda: criteria_corr_figure(data, key))
+    fig_total_corr = cached_figure(data, 'criteria-total-corr', key, lambda: criterion_vs_total_figure(data, key))
 
     return fig_crit, fig_corr, fig_total_corr
 
@@ -598,26 +1047,26 @@ def update_criteria_plot(selected_spinners, selected_judges, selected_rounds, se
 ## Rounds tab callback
 @callback(
     Output('round_line_crit', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
-    Input('criteria-dropdown', 'value')
+    Input('rounds-server-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    prevent_initial_call=True,
+    **background('round_line_crit'),
 )
-def update_rounds_line(selected_spinners, selected_judges, selected_rounds, selected_criteria):
-    filtered_df = df_long.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
-    if selected_criteria:
-        filtered_df = filtered_df[filtered_df['Criterion'].isin(selected_criteria)]
-
-    df_round_crit_filtered = filtered_df.groupby(['Round', 'Criterion'], as_index=False)['Score'].mean()
-
-    fig_line = px.line(df_round_crit_filtered, x="Round", y="Score", color="Criterion", title="Score per Criterion by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
+@instrument
+def update_rounds_line(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    df_round_crit_filtered = data.cache.get_or_compute(
+        ('table', 'round-criterion-mean', key),
+        lambda: aggregate(lambda: data.cube.stats(('Round', 'Criterion'), *key).rename(columns={'mean': 'Score'})[['Round', 'Criterion', 'Score']]),
+    )
+
+    fig_line = cached_figure(data, 'round_line_crit', key, lambda: line_figure(df_round_crit_filtered, "Round", "Score", "Criterion", ROUND_LINE_TITLE))
 
     return fig_line
 
@@ -627,28 +1076,84 @@ def update_rounds_line(selected_spinners, selected_judges, selected_rounds, sele
     Output('round_violin_creat', 'figure'),
     Output('round_violin_diff', 'figure'),
     Output('round_violin_exe', 'figure'),
-    Input('spinner-dropdown', 'value'),
-    Input('judge-dropdown', 'value'),
-    Input('round-dropdown', 'value'),
+    Input('rounds-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('full-points', 'value'),
+    prevent_initial_call=True,
+    **background('round_violin_total', 'round_violin_constr', 'round_violin_creat', 'round_violin_diff', 'round_violin_exe'),
 )
-def update_rounds_violins(selected_spinners, selected_judges, selected_rounds):
-    filtered_df = df.copy() 
-    
-    if selected_spinners:
-        filtered_df = filtered_df[filtered_df['Spinner'].isin(selected_spinners)]
-    if selected_judges:
-        filtered_df = filtered_df[filtered_df['Judge'].isin(selected_judges)]
-    if selected_rounds:
-        filtered_df = filtered_df[filtered_df['Round'].isin(selected_rounds)]
+@instrument
+def update_rounds_violins(_request, tournament, selected_spinners, selected_judges, selected_rounds, full_points):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds)
+
+    fig_total = cached_figure(data, violin_name('round_violin_total', full_points), key, lambda: violin_figure(filtered_wide(data, key), "Total", "Round", "Total Score by Round", bool(full_points)))
+    # One violin per criterion slot, from the criteria this tournament was scored on
+    fig_criteria = [
+        cached_figure(data, violin_name(graph_id, full_points), key, lambda crit=crit: violin_figure(filtered_wide(data, key), crit, "Round", f"{crit} Score by Round", bool(full_points)))
+        if crit is not None else EMPTY_FIGURE
+        for graph_id, crit in zip(ROUND_VIOLIN_GRAPHS, round_violin_criteria(data.criteria))
+    ]
+
+    return fig_total, *fig_criteria
+
+
+## Spinners tab callback
+@callback(
+    Output('spinner-standings', 'rowData'),
+    Output('spinner-rank-intervals', 'figure'),
+    Output('spinner-progression', 'figure'),
+    Output('spinner-head-to-head', 'figure'),
+    Input('spinners-request', 'data'),
+    State('tournament-dropdown', 'value'),
+    State('spinner-dropdown', 'value'),
+    State('judge-dropdown', 'value'),
+    State('round-dropdown', 'value'),
+    State('criteria-dropdown', 'value'),
+    prevent_initial_call=True,
+    **background('spinner-rank-intervals', 'spinner-progression', 'spinner-head-to-head'),
+)
+@instrument
+def update_spinners_tab(_request, tournament, selected_spinners, selected_judges, selected_rounds, selected_criteria):
+    data = catalog.get(tournament)
+    key = selection_key(selected_spinners, selected_judges, selected_rounds, selected_criteria)
+
+    # Standings, progression, head-to-head and bootstrap intervals of every selected spinner at once
+    ranking = data.cache.get_or_compute(
+        ('table', 'ranking', key),
+        lambda: aggregate(lambda: rank_spinners(filtered_long(data, key))),
+    )
+    with phase('serialize'):
+        standings = ranking['standings'].round({'Mean Z-Score': 3, 'Mean Total': 2}).to_dict('records')
+
+    fig_ranks = cached_figure(data, 'spinner-rank-intervals', key, lambda: rank_interval_figure(ranking['standings']))
+    fig_progression = cached_figure(data, 'spinner-progression', key, lambda: progression_figure(ranking))
+    fig_h2h = cached_figure(data, 'spinner-head-to-head', key, lambda: head_to_head_figure(ranking))
+
+    return standings, fig_ranks, fig_progression, fig_h2h
+
+
+def create_app():
+    background_manager = None
+    if diskcache is not None:
+        background_manager = ThreadJobManager(diskcache.Cache('data/cache/callbacks'), cache_by=[catalog.stamp], expire=3600)
+    app = Dash(__name__, background_callback_manager=background_manager)
+    app.layout = serve_layout
+    metrics.register(app.server, catalog)
+    return app
 
-    fig_total = px.violin(filtered_df, y="Total", x="Round", box=True, points="all", title="Total Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_constr = px.violin(filtered_df, y="Construction", x="Round", box=True, points="all", title="Construction Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_creat = px.violin(filtered_df, y="Creativity", x="Round", box=True, points="all", title="Creativity Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_diff = px.violin(filtered_df, y="Difficulty", x="Round", box=True, points="all", title="Difficulty Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
-    fig_exe = px.violin(filtered_df, y="Execution", x="Round", box=True, points="all", title="Execution Score by Round").update_layout(plot_bgcolor="#edf5ff", paper_bgcolor="#edf5ff").update_yaxes(showgrid=True, gridcolor="#d9e0e8", gridwidth=1, zeroline=False)
 
-    return fig_total, fig_constr, fig_creat, fig_diff, fig_exe
+def __getattr__(name):
+    # app and server are created on first access (gunicorn's statapp:server), not on import
+    if name not in ('app', 'server'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    app = create_app()
+    globals().update(app=app, server=app.server)
+    return globals()[name]
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Violins are drawn from per-group summaries computed on the server, so the figure
+# size depends on the number of groups rather than on the number of scores.
+KDE_POINTS           = 64
+KDE_BINS             = 256
+MAX_POINTS_PER_GROUP = 150
+VIOLIN_COLOR         = "#636efa"
+
+
+def sorted_quantile(sorted_values, starts, counts, q):
+    # Linear-interpolated quantile of every group run in a group-then-value sorted array
+    position = starts + q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize_groups(values, groups, kde_points=KDE_POINTS, max_points=MAX_POINTS_PER_GROUP):
+    values = np.asarray(values, dtype=float)
+    codes, labels = pd.factorize(groups, sort=True)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+    labels = list(labels)
+
+    if len(values) == 0:
+        return None
+
+    # Only groups present after filtering, in label order
+    present = np.unique(codes)
+    labels = [labels[c] for c in present]
+    codes = np.searchsorted(present, codes)
+    n_groups = len(labels)
+
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+    bounds = np.searchsorted(sorted_codes, np.arange(n_groups + 1))
+    starts, counts = bounds[:-1], np.diff(bounds)
+
+    # Box statistics
+    q1 = sorted_quantile(sorted_values, starts, counts, 0.25)
+    median = sorted_quantile(sorted_values, starts, counts, 0.5)
+    q3 = sorted_quantile(sorted_values, starts, counts, 0.75)
+    iqr = q3 - q1
+    low_limit = (q1 - 1.5 * iqr)[sorted_codes]
+    high_limit = (q3 + 1.5 * iqr)[sorted_codes]
+    inside = (sorted_values >= low_limit) & (sorted_values <= high_limit)
+    lowerfence = np.minimum.reduceat(np.where(inside, sorted_values, np.inf), starts)
+    upperfence = np.maximum.reduceat(np.where(inside, sorted_values, -np.inf), starts)
+    mean = np.add.reduceat(sorted_values, starts) / counts
+    variance = np.add.reduceat((sorted_values - mean[sorted_codes]) ** 2, starts) / counts
+    std = np.sqrt(variance)
+    minimum = sorted_values[starts]
+    maximum = sorted_values[bounds[1:] - 1]
+
+    # Silverman bandwidth, as plotly uses for its client-side violins
+    spread = np.where(iqr > 0, np.minimum(std, iqr / 1.349), std)
+    bandwidth = 0.9 * spread * counts ** -0.2
+    value_range = max(sorted_values[-1] - sorted_values[0], 1.0)
+    bandwidth = np.where(bandwidth > 0, bandwidth, value_range * 0.01)
+
+    # Binned Gaussian KDE: one histogram per group, then a groups x grid x bins kernel sum
+    low, high = values.min(), values.max()
+    width = (high - low) / KDE_BINS or 1.0
+    bins = np.clip(((values - low) / width).astype(np.int64), 0, KDE_BINS - 1)
+    hist = np.bincount(codes * KDE_BINS + bins, minlength=n_groups * KDE_BINS).reshape(n_groups, KDE_BINS)
+    centers = low + (np.arange(KDE_BINS) + 0.5) * width
+
+    steps = np.linspace(0, 1, kde_points)
+    grid = (minimum - 2 * bandwidth)[:, None] + steps[None, :] * ((maximum - minimum) + 4 * bandwidth)[:, None]
+    scaled = (grid[:, :, None] - centers[None, None, :]) / bandwidth[:, None, None]
+    density = (np.exp(-0.5 * scaled ** 2) * hist[:, None, :]).sum(axis=2)
+    density /= (counts * bandwidth * np.sqrt(2 * np.pi))[:, None]
+
+    # Capped point sample per group: evenly spaced through the sorted run (so it is
+    # stratified by quantile and keeps both extremes), plus outliers within the cap
+    sample_values = []
+    sample_groups = []
+    for g in range(n_groups):
+        run = sorted_values[starts[g]:bounds[g + 1]]
+        if len(run) <= max_points:
+            picked = run
+        else:
+            outliers = np.flatnonzero(~inside[starts[g]:bounds[g + 1]])[: max_points // 2]
+            spaced = np.round(np.linspace(0, len(run) - 1, max_points - len(outliers))).astype(np.int64)
+            picked = run[np.union1d(spaced, outliers)]
+        sample_values.append(picked)
+        sample_groups.append(np.full(len(picked), g))
+
+    return {
+        "labels": labels,
+        "count": counts,
+        "mean": mean,
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": lowerfence,
+        "upperfence": upperfence,
+        "grid": grid,
+        "density": density,
+        "sample_values": np.concatenate(sample_values),
+        "sample_groups": np.concatenate(sample_groups),
+    }
+
+
+def summary_violin_figure(summary, x, y, title):
+    fig = go.Figure()
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, showlegend=False)
+    if summary is None:
+        return fig
+
+    positions = np.arange(len(summary["labels"]))
+    half_width = 0.4 * summary["density"] / summary["density"].max(axis=1, keepdims=True)
+
+    # Outline coordinates only need screen precision
+    for i in positions:
+        grid = np.round(summary["grid"][i], 4)
+        outline = np.round(half_width[i], 4)
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([i + outline, (i - outline)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            mode="lines",
+            fill="toself",
+            line={"color": VIOLIN_COLOR, "width": 1},
+            opacity=0.5,
+            hoverinfo="skip",
+        ))
+
+    fig.add_trace(go.Box(
+        x=positions,
+        q1=summary["q1"],
+        median=summary["median"],
+        q3=summary["q3"],
+        lowerfence=summary["lowerfence"],
+        upperfence=summary["upperfence"],
+        mean=summary["mean"],
+        width=0.12,
+        boxpoints=False,
+        marker_color=VIOLIN_COLOR,
+    ))
+
+    # Deterministic jitter keeps cached figures identical between runs
+    groups = summary["sample_groups"]
+    jitter = (np.random.default_rng(0).random(len(groups)) - 0.5) * 0.3
+    fig.add_trace(go.Scatter(
+        x=np.round(groups + jitter, 3),
+        y=summary["sample_values"],
+        mode="markers",
+        marker={"color": VIOLIN_COLOR, "size": 4, "opacity": 0.6},
+        hovertemplate=f"{y}=%{{y}}<extra></extra>",
+    ))
+
+    fig.update_xaxes(tickvals=positions, ticktext=[str(label) for label in summary["labels"]])
+    return fig